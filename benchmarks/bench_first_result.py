@@ -0,0 +1,65 @@
+"""Tiempo hasta el primer resultado útil frente al informe completo (modo --progressive)
+
+Uso:
+    python benchmarks/bench_first_result.py [--numbers 50] [--latency www.google.com=800]
+        [--default-latency 50]
+
+Ejecuta parallel_check sobre números distintos con las peticiones de red redirigidas a
+benchmarks/mock_server.py y, gracias a on_result, mide para cada número cuándo llega la primera
+sección, cuándo llega Información_básica y cuándo termina el informe completo (el momento en que
+se mostraba algo antes del modo progresivo). Muestra p50/p95 de cada uno.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_hot_paths import lift_rate_limits, load_script, percentile, sample_numbers  # noqa: E402
+from mock_server import MockSite, install_mock_adapter, parse_latencies, start_mock_server  # noqa: E402
+
+def measure(dp, number):
+    """Devuelve (primera sección, Información_básica, informe completo) en segundos"""
+    arrivals = {}
+    started = time.perf_counter()
+    
+    def on_result(name, result):
+        arrivals[name] = time.perf_counter() - started
+    
+    dp.parallel_check(number, dp.CHECK_FUNCTIONS, on_result=on_result)
+    total = time.perf_counter() - started
+    return min(arrivals.values()), arrivals.get("Información_básica", total), total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default="donkey_punch_V2.py")
+    parser.add_argument("--numbers", type=int, default=50)
+    parser.add_argument("--latency", action="append", default=[], metavar="HOST=MS",
+                        help="Latencia simulada de un host (repetible; por defecto www.google.com=800)")
+    parser.add_argument("--default-latency", type=float, default=50.0, metavar="MS")
+    args = parser.parse_args(argv)
+    args.latency = args.latency or ["www.google.com=800"]
+    
+    site = MockSite(parse_latencies(args.latency), args.default_latency / 1000)
+    server, base_url = start_mock_server(site)
+    dp = load_script(args.script)
+    install_mock_adapter(dp.get_http_session(), base_url)
+    lift_rate_limits(dp)
+    
+    numbers = sample_numbers(args.numbers + 1)
+    # Una ronda previa carga los módulos perezosos (metadatos de operadoras, etc.)
+    measure(dp, numbers.pop())
+    samples = [measure(dp, number) for number in numbers]
+    server.shutdown()
+    
+    print(f"{args.script}: {len(samples)} números, latencias {', '.join(args.latency)}, "
+          f"resto {args.default_latency:g} ms")
+    print(f"{'momento':<26} {'p50 ms':>9} {'p95 ms':>9}")
+    for index, label in enumerate(("primera sección", "Información básica", "informe completo")):
+        ordered = sorted(sample[index] for sample in samples)
+        print(f"{label:<26} {percentile(ordered, 0.50) * 1000:9.1f} {percentile(ordered, 0.95) * 1000:9.1f}")
+
+if __name__ == "__main__":
+    main()
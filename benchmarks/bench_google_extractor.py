@@ -0,0 +1,77 @@
+"""Compara GoogleResultExtractor con el análisis anterior basado en BeautifulSoup
+
+Uso:
+    python benchmarks/bench_google_extractor.py [--repeat 50] [--chunk-size 16384] [fixtures...]
+
+Por defecto usa las páginas guardadas en benchmarks/fixtures/google_search_<número>.html; el
+número buscado se toma del nombre del archivo. Verifica que ambos caminos dan las mismas
+menciones y enlaces antes de medir.
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import donkey_punch_V2 as dp  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "google_search_*.html")
+
+def parse_with_bs4(clean_num, page):
+    """Camino original de check_google_search: DOM completo + str.count"""
+    soup = BeautifulSoup(page, 'html.parser')
+    mentions = page.count(clean_num)
+    links = set()
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if "http" in href and not any(x in href for x in ["google.com", "youtube.com"]):
+            clean_link = re.sub(r'&sa=.*', '', href.replace("/url?q=", ""))
+            links.add(urllib.parse.unquote(clean_link))
+    return mentions, links
+
+def parse_streaming(clean_num, page, chunk_size):
+    """GoogleResultExtractor alimentado por trozos, como llega el cuerpo de la respuesta"""
+    extractor = dp.GoogleResultExtractor(clean_num)
+    for start in range(0, len(page), chunk_size):
+        extractor.feed(page[start:start + chunk_size])
+    extractor.close()
+    return extractor.mentions, set(extractor.links)
+
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixtures", nargs="*")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=16384)
+    args = parser.parse_args(argv)
+    
+    for path in args.fixtures or sorted(glob.glob(FIXTURES)):
+        with open(path, 'r', encoding='utf-8') as f:
+            page = f.read()
+        clean_num = re.sub(r'[^0-9]', '', os.path.basename(path))
+        
+        expected = parse_with_bs4(clean_num, page)
+        got = parse_streaming(clean_num, page, args.chunk_size)
+        if got != expected:
+            sys.exit(f"{path}: resultados distintos\n  bs4: {expected}\n  streaming: {got}")
+        
+        bs4_time = measure(lambda: parse_with_bs4(clean_num, page), args.repeat)
+        stream_time = measure(lambda: parse_streaming(clean_num, page, args.chunk_size), args.repeat)
+        print(f"{os.path.basename(path)} ({len(page) / 1024:.0f} KiB, {expected[0]} menciones, {len(expected[1])} enlaces)")
+        print(f"  BeautifulSoup  {bs4_time * 1000:8.2f} ms/página  {1 / bs4_time:8.1f} páginas/s")
+        print(f"  Streaming      {stream_time * 1000:8.2f} ms/página  {1 / stream_time:8.1f} páginas/s"
+              f"  (x{bs4_time / stream_time:.1f})")
+
+if __name__ == "__main__":
+    main()
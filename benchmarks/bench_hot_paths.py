@@ -0,0 +1,227 @@
+"""Benchmarks de los caminos calientes con un servidor HTTP simulado y comparación con una línea base
+
+Uso:
+    python benchmarks/bench_hot_paths.py [--script donkey_punch_V2.py] [--iterations 2000]
+        [--rounds 20] [--latency www.google.com=150] [--default-latency 30]
+        [--baseline benchmarks/baseline_hot_paths.json] [--save-baseline] [--tolerance 0.2]
+
+Mide validate_phone_number, get_basic_info, check_number_reputation,
+check_phone_format_variations, save_to_file y una ronda completa de parallel_check. Las
+verificaciones de red van contra benchmarks/mock_server.py (páginas guardadas de Google, whois.com
+y sitios de reputación) con la latencia indicada, nunca contra internet; los límites de velocidad
+por host se desactivan salvo con --keep-rate-limits.
+
+Para cada caso muestra operaciones/s y latencias p50/p95/p99. Si existe la línea base del
+script, marca como regresión cualquier caso cuyas operaciones/s caigan más de --tolerance y
+termina con código 1. La línea base depende de la máquina, así que no se versiona: genérala con
+--save-baseline en la misma máquina donde se vaya a comparar.
+
+Por defecto cada llamada de un caso usa un número distinto y la caché de contextos por número
+se vacía antes de cada caso, así se mide el camino en frío que recorre un lote real.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from mock_server import MockSite, install_mock_adapter, parse_latencies, start_mock_server  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline_hot_paths.json")
+
+# Regiones de las que se toman números de ejemplo (móviles y fijos) para variar las entradas
+SAMPLE_REGIONS = ["ES", "US", "MX", "AR", "CO", "GB", "FR", "DE", "IT", "BR", "CL", "PE"]
+
+def load_script(script):
+    """Importa un script por ruta (donkey-punch.py no es importable por nombre)"""
+    name = os.path.splitext(os.path.basename(script))[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, script))
+    module = importlib.util.module_from_spec(spec)
+    # Registrado para que los pools de procesos puedan serializar sus funciones
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def sample_numbers(count):
+    """Números válidos distintos para que las cachés por número no oculten el coste real"""
+    import phonenumbers
+    
+    kinds = (phonenumbers.PhoneNumberType.MOBILE, phonenumbers.PhoneNumberType.FIXED_LINE)
+    examples = [phonenumbers.example_number_for_type(region, kind)
+                for region in SAMPLE_REGIONS for kind in kinds]
+    examples = [example for example in examples if example is not None]
+    numbers = []
+    seen = set()
+    for index, example in enumerate(examples):
+        # Si un ejemplo se solapa con otro (móvil y fijo iguales), los siguientes cubren la falta
+        per_example = -(-(count - len(numbers)) // (len(examples) - index))
+        found = 0
+        for offset in range(per_example * 10):
+            candidate = phonenumbers.PhoneNumber(country_code=example.country_code,
+                                                 national_number=example.national_number + offset)
+            formatted = phonenumbers.format_number(candidate, phonenumbers.PhoneNumberFormat.E164)
+            if formatted not in seen and phonenumbers.is_valid_number(candidate):
+                seen.add(formatted)
+                numbers.append(formatted)
+                found += 1
+                if found == per_example:
+                    break
+    return numbers[:count]
+
+def check_functions(dp):
+    """Verificaciones de una ronda completa, como las usa main() de cada script"""
+    if hasattr(dp, "CHECK_FUNCTIONS"):
+        return dp.CHECK_FUNCTIONS
+    return {
+        "Información básica": dp.get_basic_info,
+        "Búsqueda en Google": dp.check_google_search,
+        "Redes sociales": dp.check_social_media,
+        "Datos de filtraciones": dp.check_breach_data,
+        "Información de operadora": dp.check_carrier_info,
+        "Reputación del número": dp.check_number_reputation,
+        "WhatsApp/Telegram": lambda x: {"WhatsApp": dp.check_whatsapp(x), "Telegram": dp.check_telegram(x)},
+        "Listas negras": dp.check_phone_blacklists,
+        "Directorios telefónicos": dp.check_phone_book,
+        "Variaciones de formato": dp.check_phone_format_variations,
+        "Registro de dominio": dp.check_domain_registrar,
+    }
+
+def lift_rate_limits(dp):
+    if hasattr(dp, "RATE_LIMITER"):
+        dp.RATE_LIMITER.limits.clear()
+    if hasattr(dp, "_rate_buckets"):
+        dp._rate_buckets.clear()
+
+def clear_number_caches(dp):
+    """Vacía las cachés por número para que un caso no aproveche el trabajo del anterior"""
+    build_context = getattr(dp, "build_context", None)
+    if build_context is not None:
+        build_context.cache_clear()
+
+def run_case(func, numbers, iterations):
+    """Ejecuta `func` sobre los números en rueda; devuelve las latencias en segundos"""
+    samples = []
+    for i in range(iterations):
+        number = numbers[i % len(numbers)]
+        start = time.perf_counter()
+        func(number)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "ops_per_sec": len(samples) / sum(samples),
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "mean_ms": statistics.mean(samples) * 1000,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default="donkey_punch_V2.py")
+    parser.add_argument("--iterations", type=int, default=2000,
+                        help="Llamadas por caso local (por defecto 2000)")
+    parser.add_argument("--rounds", type=int, default=20,
+                        help="Rondas completas de parallel_check (por defecto 20)")
+    parser.add_argument("--numbers", type=int, default=None,
+                        help="Números distintos usados en rueda (por defecto tantos como --iterations)")
+    parser.add_argument("--latency", action="append", default=[], metavar="HOST=MS",
+                        help="Latencia simulada de un host (repetible)")
+    parser.add_argument("--default-latency", type=float, default=20.0, metavar="MS",
+                        help="Latencia simulada del resto de hosts (por defecto 20 ms)")
+    parser.add_argument("--keep-rate-limits", action="store_true")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Guarda los resultados como nueva línea base del script")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Caída de operaciones/s tolerada antes de marcar regresión (por defecto 0.2)")
+    args = parser.parse_args(argv)
+    
+    site = MockSite(parse_latencies(args.latency), args.default_latency / 1000)
+    server, base_url = start_mock_server(site)
+    dp = load_script(args.script)
+    install_mock_adapter(dp.get_http_session(), base_url)
+    if not args.keep_rate_limits:
+        lift_rate_limits(dp)
+    
+    numbers = sample_numbers(args.numbers or max(args.iterations, args.rounds))
+    functions = check_functions(dp)
+    cases = [
+        ("validate_phone_number", dp.validate_phone_number, args.iterations),
+        ("get_basic_info", dp.get_basic_info, args.iterations),
+        ("check_number_reputation", dp.check_number_reputation, args.iterations),
+        ("check_phone_format_variations", dp.check_phone_format_variations, args.iterations),
+        ("save_to_file", lambda number: dp.save_to_file(number, {"Información básica": dp.get_basic_info(number)}),
+         max(1, args.iterations // 10)),
+        ("parallel_check", lambda number: dp.parallel_check(number, functions), args.rounds),
+    ]
+    # La reputación de donkey-punch.py consulta sitios externos: cuenta como caso de red
+    if not hasattr(dp, "REPUTATION_ENGINE"):
+        cases[2] = ("check_number_reputation", dp.check_number_reputation, args.rounds)
+    
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # save_to_file escribe en el directorio actual
+        os.chdir(workdir)
+        try:
+            for name, func, iterations in cases:
+                # Una llamada previa carga los módulos perezosos (metadatos de operadoras, etc.)
+                func(numbers[-1])
+                clear_number_caches(dp)
+                results[name] = summarize(run_case(func, numbers, iterations))
+        finally:
+            os.chdir(cwd)
+    server.shutdown()
+    
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+    # Las cachés por número hacen que los resultados dependan de estos parámetros
+    parameters = {"iterations": args.iterations, "rounds": args.rounds, "numbers": len(numbers),
+                  "latency": sorted(args.latency), "default_latency": args.default_latency}
+    baseline = baselines.get(os.path.basename(args.script), {})
+    if baseline and baseline.get("parameters") != parameters:
+        print("Aviso: la línea base se generó con otros parámetros; no se compara", file=sys.stderr)
+        baseline = {}
+    
+    print(f"{args.script}: {len(numbers)} números, latencia simulada {args.default_latency:g} ms "
+          f"({site.requests} peticiones al servidor simulado)")
+    print(f"{'caso':<30} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  línea base")
+    regressions = []
+    for name, stats in results.items():
+        line = (f"{name:<30} {stats['ops_per_sec']:10.1f} {stats['p50_ms']:9.2f} "
+                f"{stats['p95_ms']:9.2f} {stats['p99_ms']:9.2f}")
+        reference = baseline.get("results", {}).get(name)
+        if reference:
+            change = stats["ops_per_sec"] / reference["ops_per_sec"] - 1
+            line += f"  {change:+.0%}"
+            if change < -args.tolerance:
+                line += "  REGRESIÓN"
+                regressions.append(name)
+        print(line)
+    
+    if args.save_baseline:
+        baselines[os.path.basename(args.script)] = {"parameters": parameters, "results": results}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=4, ensure_ascii=False)
+            f.write("\n")
+        print(f"Línea base guardada en {args.baseline}")
+    elif regressions:
+        sys.exit(f"Regresiones respecto a la línea base: {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""get_basic_info con y sin el índice de prefijos compilado (--prefix-index)
+
+Uso:
+    python benchmarks/bench_prefix_index.py [--numbers 5000] [--regions ES,MX,AR] [--index-dir DIR]
+
+Cada variante se ejecuta en un proceso nuevo para que la memoria de uno no contamine al otro:
+primero una pasada que carga datos y cachés, después la pasada medida. Muestra µs por número y
+memoria residente máxima del proceso. Con --regions solo se usan números de esas regiones
+(de las de bench_hot_paths.SAMPLE_REGIONS). El índice se compila en --index-dir si no existe (por
+defecto un directorio temporal), y el tiempo de compilación se muestra aparte.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER_CODE = """
+import json, resource, sys, time
+sys.path.insert(0, {benchmarks!r})
+from bench_hot_paths import load_script, sample_numbers
+dp = load_script({script!r})
+if {index_dir!r}:
+    dp.enable_prefix_index({index_dir!r}, {regions!r})
+contexts = [dp.get_context(number) for number in sample_numbers({count!r})]
+if {regions!r}:
+    contexts = [ctx for ctx in contexts if ctx.region_code in {regions!r}]
+for ctx in contexts:
+    dp.get_basic_info(ctx)
+start = time.perf_counter()
+for ctx in contexts:
+    dp.get_basic_info(ctx)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"us": elapsed / len(contexts) * 1e6,
+                  "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+BUILD_CODE = """
+import json, os, sys
+sys.path.insert(0, {benchmarks!r})
+from bench_hot_paths import load_script
+index = load_script({script!r}).enable_prefix_index({index_dir!r}, {regions!r})
+print(json.dumps({{"path": index.path, "rows": index.meta["rows"], "size": os.path.getsize(index.path)}}))
+"""
+
+def run_code(template, **values):
+    """Ejecuta un fragmento en un proceso nuevo (la memoria máxima se hereda al hacer fork)"""
+    code = template.format(benchmarks=os.path.join(ROOT, "benchmarks"), **values)
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default="donkey_punch_V2.py")
+    parser.add_argument("--numbers", type=int, default=5000)
+    parser.add_argument("--regions", help="Regiones del índice separadas por comas (por defecto todas)")
+    parser.add_argument("--index-dir", help="Directorio del índice (por defecto uno temporal)")
+    args = parser.parse_args(argv)
+    regions = args.regions.upper().split(",") if args.regions else None
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        index_dir = args.index_dir or workdir
+        start = time.perf_counter()
+        index = run_code(BUILD_CODE, script=args.script, index_dir=index_dir, regions=regions)
+        built = time.perf_counter() - start
+        print(f"índice {os.path.basename(index['path'])}: {index['rows']} rangos, "
+              f"{index['size'] / 1e6:.1f} MB, listo en {built:.1f} s (con arranque del proceso)")
+        
+        results = {
+            "phonenumbers": run_code(WORKER_CODE, script=args.script, count=args.numbers,
+                                     index_dir=None, regions=regions),
+            "índice de prefijos": run_code(WORKER_CODE, script=args.script, count=args.numbers,
+                                           index_dir=index_dir, regions=regions),
+        }
+    
+    print(f"{'get_basic_info':<22} {'µs/número':>10} {'RSS máx MB':>11}")
+    for name, stats in results.items():
+        print(f"{name:<22} {stats['us']:10.1f} {stats['rss_mb']:11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Prueba de carga del modo servicio (--serve), todo en localhost
+
+Uso:
+    python benchmarks/bench_service.py [--clients 32] [--requests 5000] [--distinct 500]
+        [--batch-size 0] [--workers 32] [--latency www.google.com=100] [--default-latency 20]
+
+Arranca donkey_punch_V2.py en modo servicio en otro proceso, con las peticiones externas
+redirigidas a benchmarks/mock_server.py, y lo carga desde `--clients` conexiones keep-alive.
+Con --batch-size > 0 usa POST /lote en lugar de GET /analizar. Muestra peticiones/s, latencias
+p50/p95/p99 y cuántos análisis se unieron a otro ya en curso.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_hot_paths import sample_numbers, summarize  # noqa: E402
+
+SERVICE_CODE = """
+import sys
+sys.path.insert(0, {benchmarks!r})
+import donkey_punch_V2 as dp
+from mock_server import MockSite, install_mock_adapter, parse_latencies, start_mock_server
+
+site = MockSite(parse_latencies({latencies!r}), {default_latency!r})
+server, base_url = start_mock_server(site)
+install_mock_adapter(dp.get_http_session(), base_url)
+dp.RATE_LIMITER.limits.clear()
+dp.run_service({address!r}, workers={workers!r})
+"""
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_service(port, workers, latencies, default_latency):
+    code = SERVICE_CODE.format(benchmarks=os.path.join(ROOT, "benchmarks"), latencies=latencies,
+                               default_latency=default_latency, address=f"127.0.0.1:{port}",
+                               workers=workers)
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=ROOT, env=env, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/salud")
+            if connection.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("El servicio no arrancó a tiempo")
+
+def client(port, jobs, samples, errors, lock):
+    """Un cliente con una conexión keep-alive que toma trabajos hasta que se acaban"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    while True:
+        with lock:
+            if not jobs:
+                break
+            job = jobs.pop()
+        start = time.perf_counter()
+        if isinstance(job, list):
+            body = json.dumps({"numeros": job})
+            connection.request("POST", "/lote", body=body, headers={"Content-Type": "application/json"})
+        else:
+            connection.request("GET", "/analizar?numero=" + urllib.parse.quote(job))
+        response = connection.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - start
+        with lock:
+            samples.append(elapsed)
+            if response.status != 200:
+                errors[response.status] = errors.get(response.status, 0) + 1
+    connection.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--distinct", type=int, default=500,
+                        help="Números distintos entre los que se reparten las peticiones")
+    parser.add_argument("--batch-size", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=32, help="Análisis simultáneos del servicio")
+    parser.add_argument("--latency", action="append", default=[], metavar="HOST=MS")
+    parser.add_argument("--default-latency", type=float, default=20.0, metavar="MS")
+    args = parser.parse_args(argv)
+    
+    port = free_port()
+    proc = start_service(port, args.workers, args.latency, args.default_latency / 1000)
+    try:
+        numbers = sample_numbers(args.distinct)
+        requested = [numbers[i % len(numbers)] for i in range(args.requests)]
+        if args.batch_size:
+            jobs = [requested[i:i + args.batch_size] for i in range(0, len(requested), args.batch_size)]
+        else:
+            jobs = requested
+        jobs.reverse()
+        samples, errors, lock = [], {}, threading.Lock()
+        
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(port, jobs, samples, errors, lock))
+                   for _ in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        connection.request("GET", "/metrics.json")
+        counters = json.loads(connection.getresponse().read())["contadores"]
+    finally:
+        proc.terminate()
+        proc.wait()
+    
+    analysed = sum(entry["valor"] for entry in counters.get("service_numbers_total", []))
+    coalesced = sum(entry["valor"] for entry in counters.get("service_coalesced_total", []))
+    stats = summarize(samples)
+    kind = f"POST /lote de {args.batch_size}" if args.batch_size else "GET /analizar"
+    print(f"{len(samples)} peticiones ({kind}) desde {args.clients} clientes en {elapsed:.1f} s: "
+          f"{len(samples) / elapsed:.1f} pet/s, {args.requests / elapsed:.1f} núm/s")
+    print(f"latencia p50 {stats['p50_ms']:.1f} ms  p95 {stats['p95_ms']:.1f} ms  p99 {stats['p99_ms']:.1f} ms")
+    print(f"análisis ejecutados {analysed}, unidos a uno en curso {coalesced}, errores {errors or 'ninguno'}")
+
+if __name__ == "__main__":
+    main()
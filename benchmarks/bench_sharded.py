@@ -0,0 +1,77 @@
+"""Coste por línea del lector por fragmentos (--sharded) frente al análisis en sí
+
+Uso:
+    python benchmarks/bench_sharded.py [--lines 200000] [--processes 0] [--shard-mb 0.25] [--prefix-index]
+
+Genera un archivo temporal con --lines números (repitiendo los de bench_hot_paths) y mide:
+validate_phone_number + get_basic_info en un bucle dentro del proceso (el coste del análisis),
+run_batch_hybrid con solo la información básica (el padre lee y envía las líneas) y
+run_batch_sharded (cada proceso mapea el archivo y lee su rango). La salida va a /dev/null.
+Con un solo proceso la diferencia con el bucle es la sobrecarga por línea de cada modo; con
+varios, además, cuánto escala.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_hot_paths import load_script, sample_numbers  # noqa: E402
+
+def write_numbers(path, count):
+    numbers = sample_numbers(min(count, 5000))
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            f.write(numbers[i % len(numbers)] + "\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default="donkey_punch_V2.py")
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--processes", type=int, default=0, help="0 = uno por núcleo")
+    parser.add_argument("--shard-mb", type=float, default=0.25)
+    parser.add_argument("--prefix-index", action="store_true", help="Usa el índice de prefijos compilado")
+    args = parser.parse_args(argv)
+    
+    dp = load_script(args.script)
+    functions = {"Información_básica": dp.CHECK_FUNCTIONS["Información_básica"]}
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.prefix_index:
+            dp.enable_prefix_index(workdir)
+        path = os.path.join(workdir, "numeros.txt")
+        write_numbers(path, args.lines)
+        
+        def in_process():
+            # Mismo trabajo por línea que los procesos, sin reparto ni salida
+            for number in dp.iter_numbers(path):
+                if dp.validate_phone_number(number):
+                    dp.get_basic_info(number)
+        
+        cases = [
+            ("análisis en el proceso", in_process),
+            ("híbrido (--processes)", lambda: dp.run_batch_hybrid(
+                dp.iter_numbers(path), functions, sink, processes=args.processes, progress_every=0)),
+            ("fragmentos (--sharded)", lambda: dp.run_batch_sharded(
+                path, output=sink, processes=args.processes, shard_bytes=int(args.shard_mb * 1024 * 1024),
+                progress_every=0)),
+        ]
+        results = []
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:
+            for name, case in cases:
+                sink = dp.JsonLinesSink(devnull)
+                dp.build_context.cache_clear()
+                start = time.perf_counter()
+                case()
+                results.append((name, time.perf_counter() - start))
+    
+    processes = args.processes or os.cpu_count() or 1
+    print(f"{args.lines} líneas, {processes} procesos, {args.shard_mb:g} MB por rango")
+    print(f"{'modo':<26} {'µs/línea':>9} {'líneas/s':>11}")
+    for name, elapsed in results:
+        print(f"{name:<26} {elapsed / args.lines * 1e6:9.1f} {args.lines / elapsed:11.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Mide el arranque en frío de los scripts: tiempo hasta el primer prompt y hasta el primer resultado
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 10] [--script donkey_punch_V2.py] [--importtime]
+
+Cada medida lanza un intérprete nuevo, como las ejecuciones cortas en producción. Con
+--importtime se muestran además los módulos que más tardan en importarse (python -X importtime).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT_MARKER = "Ingrese el número telefónico".encode("utf-8")
+SAMPLE_NUMBER = "+34600112233"
+
+FIRST_RESULT_CODE = f"""
+import donkey_punch_V2 as dp
+assert dp.validate_phone_number({SAMPLE_NUMBER!r})
+print(dp.get_basic_info({SAMPLE_NUMBER!r})["Operadora"])
+"""
+
+def _env():
+    env = dict(os.environ, TERM="dumb", PYTHONIOENCODING="utf-8")
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def time_to_first_prompt(script):
+    """Segundos desde el lanzamiento hasta que el script pide el primer número"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, script)], cwd=ROOT, env=_env(),
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    seen = b""
+    while PROMPT_MARKER not in seen:
+        chunk = proc.stdout.read1(4096)
+        if not chunk:
+            proc.wait()
+            raise RuntimeError(f"{script} terminó sin mostrar el prompt")
+        seen += chunk
+    elapsed = time.perf_counter() - start
+    proc.communicate(b"q\n")
+    return elapsed
+
+def time_to_first_result():
+    """Segundos desde el lanzamiento hasta obtener la información básica de un número"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", FIRST_RESULT_CODE], cwd=ROOT, env=_env(),
+                   check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def import_profile(module, top=15):
+    """Módulos con mayor tiempo de importación acumulado según python -X importtime"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, env=_env(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us), int(self_us), name))
+    return sorted(rows, reverse=True)[:top]
+
+def summarize(label, samples):
+    print(f"{label:<28} mín {min(samples) * 1000:8.1f} ms   mediana {statistics.median(samples) * 1000:8.1f} ms"
+          f"   máx {max(samples) * 1000:8.1f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--script", default="donkey_punch_V2.py")
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args(argv)
+    
+    summarize(f"Primer prompt ({args.script})", [time_to_first_prompt(args.script) for _ in range(args.runs)])
+    summarize("Primer resultado (v2)", [time_to_first_result() for _ in range(args.runs)])
+    
+    if args.importtime:
+        print("\nImportaciones más costosas (acumulado):")
+        for cumulative_us, self_us, name in import_profile("donkey_punch_V2"):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
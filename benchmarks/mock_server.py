@@ -0,0 +1,139 @@
+"""Servidor HTTP local que sustituye a Google, whois.com y los sitios de reputación en los benchmarks
+
+Sirve las páginas guardadas en benchmarks/fixtures con una latencia configurable por host.
+install_mock_adapter() redirige todas las peticiones de una sesión de requests (http y https,
+cualquier host) a este servidor, así los scripts se miden sin tocar su código ni la red.
+
+Uso directo (para probar a mano):
+    python benchmarks/mock_server.py --port 8765 --latency www.google.com=200 --default-latency 50
+"""
+import argparse
+import glob
+import os
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+REPUTATION_HOSTS = {
+    "numspy.io", "sync.me", "spamcalls.net", "www.tellows.es", "www.shouldianswer.com",
+    "callercenter.com", "www.phonebook.com", "www.truecaller.com",
+}
+
+GENERIC_PAGE = b"<!doctype html><html><head><title>OK</title></head><body><p>Sin resultados</p></body></html>"
+
+def _read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+class MockSite:
+    """Páginas y latencias que sirve el servidor, elegidas según el host original"""
+    
+    def __init__(self, latencies=None, default_latency=0.0):
+        self.latencies = dict(latencies or {})
+        self.default_latency = default_latency
+        self.google_pages = {}
+        for path in glob.glob(os.path.join(FIXTURES_DIR, "google_search_*.html")):
+            digits = re.sub(r'[^0-9]', '', os.path.basename(path))
+            with open(path, 'rb') as f:
+                self.google_pages[digits] = f.read()
+        self.default_google_page = self.google_pages[min(self.google_pages)]
+        self.whois_page = _read_fixture("whois_registry.html")
+        self.reputation_page = _read_fixture("reputation_page.html")
+        self.requests = 0
+    
+    def page_for(self, host, path, query):
+        if host == "www.google.com":
+            digits = re.sub(r'[^0-9]', '', urllib.parse.parse_qs(query).get("q", [""])[0])
+            return self.google_pages.get(digits, self.default_google_page)
+        if host == "www.whois.com":
+            return self.whois_page
+        if host in REPUTATION_HOSTS:
+            return self.reputation_page
+        return GENERIC_PAGE
+    
+    def latency_for(self, host):
+        return self.latencies.get(host, self.default_latency)
+
+def _handler_for(site):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def _respond(self, with_body):
+            # La ruta llega como /<host original>/<ruta original>
+            parts = urllib.parse.urlsplit(self.path)
+            host, _, path = parts.path.lstrip("/").partition("/")
+            site.requests += 1
+            time.sleep(site.latency_for(host))
+            page = site.page_for(host, "/" + path, parts.query)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            if with_body:
+                self.wfile.write(page)
+        
+        def do_GET(self):
+            self._respond(True)
+        
+        def do_HEAD(self):
+            self._respond(False)
+        
+        def log_message(self, *args):
+            pass
+    
+    return Handler
+
+def start_mock_server(site=None, port=0):
+    """Arranca el servidor en un hilo; devuelve (servidor, url base)"""
+    site = site or MockSite()
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler_for(site))
+    server.daemon_threads = True
+    server.site = site
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def install_mock_adapter(session, base_url):
+    """Hace que `session` envíe cualquier petición al servidor simulado en lugar de a internet"""
+    from requests.adapters import HTTPAdapter
+    
+    class MockRedirectAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            parts = urllib.parse.urlsplit(request.url)
+            request.url = f"{base_url}/{parts.hostname}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+            return super().send(request, **kwargs)
+    
+    adapter = MockRedirectAdapter(pool_connections=4, pool_maxsize=64)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def parse_latencies(rules):
+    """Convierte ['host=ms', ...] en {host: segundos}"""
+    latencies = {}
+    for rule in rules:
+        host, _, ms = rule.partition("=")
+        latencies[host] = float(ms) / 1000
+    return latencies
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", action="append", default=[], metavar="HOST=MS")
+    parser.add_argument("--default-latency", type=float, default=0.0, metavar="MS")
+    args = parser.parse_args(argv)
+    
+    site = MockSite(parse_latencies(args.latency), args.default_latency / 1000)
+    server, base_url = start_mock_server(site, args.port)
+    print(f"Servidor simulado en {base_url}/<host>/<ruta> (Ctrl+C para salir)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
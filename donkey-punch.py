@@ -1,22 +1,175 @@
-import requests
+import codecs
 import json
 import phonenumbers
-from phonenumbers import carrier, geocoder, timezone
 import os
 from datetime import datetime
-import socket
-import whois
 import re
-from bs4 import BeautifulSoup
-import dns.resolver
+import importlib
 import urllib.parse
 import time
-from concurrent.futures import ThreadPoolExecutor
-import random
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
+from functools import lru_cache, wraps
+
+class LazyModule:
+    """Módulo que solo se importa la primera vez que se usa uno de sus atributos"""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# Módulos pesados: se cargan al usarse por primera vez
+requests = LazyModule("requests")
+bs4 = LazyModule("bs4")
+carrier = LazyModule("phonenumbers.carrier")
+geocoder = LazyModule("phonenumbers.geocoder")
+timezone = LazyModule("phonenumbers.timezone")
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Conexiones keep-alive reutilizables por host
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 8
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+# Máximo de bytes que se leen de una página al buscar palabras clave
+MAX_BODY_BYTES = 512 * 1024
+
+# Timeout de cada petición HTTP y presupuesto total por número, en segundos
+HTTP_TIMEOUT = 10
+NUMBER_DEADLINE = 120
+
+# Límites por host: (peticiones por segundo, ráfaga)
+HOST_RATE_LIMITS = {
+    "www.google.com": (0.5, 2),
+    "www.whois.com": (1, 2),
+    "haveibeenpwned.com": (1, 1),
+    "numspy.io": (1, 2),
+    "sync.me": (1, 2),
+    "spamcalls.net": (1, 2),
+    "www.tellows.es": (1, 2)
+}
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def get_http_session(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE):
+    """Sesión HTTP compartida entre hilos para reutilizar conexiones por host"""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(HTTP_HEADERS)
+                _http_session = session
+    return _http_session
+
+class TokenBucket:
+    """Cubo de fichas: `rate` peticiones por segundo con ráfagas de hasta `burst`"""
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = 0 if self.tokens >= 0 else -self.tokens / self.rate
+        if delay > 0:
+            time.sleep(delay)
+
+# Caducidad de los datos por región memoizados en memoria (None = toda la vida del proceso)
+REGION_CACHE_TTL = None
+
+# El registrador del ccTLD sale de whois.com: se vuelve a consultar pasado este tiempo
+REGISTRAR_CACHE_TTL = 24 * 3600
+
+def memoize_by_region(ttl=None):
+    """Memoiza una función cuyo resultado solo depende de la región (y argumentos afines)
+    
+    Cada clave se calcula una sola vez aunque la pidan varios hilos a la vez; con `ttl` en
+    segundos el valor se recalcula al caducar. Los resultados son compartidos: no mutarlos.
+    """
+    def decorator(func):
+        entries = {}
+        key_locks = {}
+        lock = threading.Lock()
+        
+        def fresh(entry):
+            lifetime = REGION_CACHE_TTL if ttl is None else ttl
+            return entry is not None and (lifetime is None or time.monotonic() - entry[0] < lifetime)
+        
+        @wraps(func)
+        def wrapper(*args):
+            entry = entries.get(args)
+            if fresh(entry):
+                return entry[1]
+            with lock:
+                key_lock = key_locks.setdefault(args, threading.Lock())
+            with key_lock:
+                entry = entries.get(args)
+                if fresh(entry):
+                    return entry[1]
+                value = func(*args)
+                entries[args] = (time.monotonic(), value)
+                return value
+        
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+_rate_buckets = {host: TokenBucket(rate, burst) for host, (rate, burst) in HOST_RATE_LIMITS.items()}
+
+def http_get(url, **kwargs):
+    """GET por la sesión compartida esperando solo si el host está limitado"""
+    bucket = _rate_buckets.get(urllib.parse.urlsplit(url).hostname)
+    if bucket:
+        bucket.acquire()
+    return get_http_session().get(url, **kwargs)
+
+def page_contains(url, keywords, max_bytes=MAX_BODY_BYTES, chunk_size=8192, **kwargs):
+    """Busca palabras clave (sin distinguir mayúsculas) leyendo la página por trozos
+    
+    Deja de descargar en cuanto aparece alguna o al llegar a `max_bytes`.
+    """
+    keywords = [keyword.lower() for keyword in keywords]
+    overlap = max(len(keyword) for keyword in keywords) - 1
+    received = 0
+    tail = ""
+    
+    with http_get(url, stream=True, **kwargs) as response:
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        for chunk in response.iter_content(chunk_size):
+            received += len(chunk)
+            text = tail + decoder.decode(chunk).lower()
+            if any(keyword in text for keyword in keywords):
+                return True
+            tail = text[-overlap:] if overlap else ""
+            if received >= max_bytes:
+                break
+    return False
+
+def fetch_status(url, **kwargs):
+    """Código de estado HTTP sin leer el cuerpo de la respuesta"""
+    with http_get(url, stream=True, **kwargs) as response:
+        return response.status_code
+
 def validate_phone_number(number):
     try:
         parsed_number = phonenumbers.parse(number, None)
@@ -79,11 +232,8 @@ def check_google_search(number):
         ).replace("+", "")
         
         url = f"https://www.google.com/search?q={formatted_number}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        response = http_get(url, timeout=HTTP_TIMEOUT)
+        soup = bs4.BeautifulSoup(response.text, 'html.parser')
         
         results = {
             "Enlaces relacionados": [],
@@ -136,17 +286,14 @@ def check_breach_data(number):
         
         # Simular consulta a Have I Been Pwned (sin API key)
         url = f"https://haveibeenpwned.com/unifiedsearch/{formatted_number}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers)
+        status_code = fetch_status(url, timeout=HTTP_TIMEOUT)
         
-        if response.status_code == 200:
+        if status_code == 200:
             return {"status": "Posible filtración encontrada", "source": "Have I Been Pwned"}
-        elif response.status_code == 404:
+        elif status_code == 404:
             return {"status": "No se encontraron filtraciones conocidas"}
         else:
-            return {"status": "No se pudo verificar", "error": response.status_code}
+            return {"status": "No se pudo verificar", "error": status_code}
     except:
         return {"error": "No se pudo verificar datos de filtraciones"}
 
@@ -156,31 +303,32 @@ def check_domain_registrar(number):
         parsed_number = phonenumbers.parse(number, None)
         country_code = phonenumbers.region_code_for_number(parsed_number)
         
-        # Buscar dominios relacionados con el código de país
-        url = f"https://www.whois.com/whois/{country_code.lower()}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        registrar_info = {
-            "Dominio ccTLD": f".{country_code.lower()}",
-            "Registrador": "No encontrado",
-            "Información": "No encontrada"
-        }
-        
-        # Intentar extraer información del registrador
-        for div in soup.find_all('div', class_='df-raw'):
-            if "Registrar:" in div.text:
-                registrar_info["Registrador"] = div.text.replace("Registrar:", "").strip()
-            if "URL:" in div.text:
-                registrar_info["Información"] = div.text.strip()
-        
-        return registrar_info
+        return dict(get_registrar_info(country_code))
     except:
         return {"error": "No se pudo obtener información del registrador"}
 
+@memoize_by_region(ttl=REGISTRAR_CACHE_TTL)
+def get_registrar_info(country_code):
+    # Buscar dominios relacionados con el código de país
+    url = f"https://www.whois.com/whois/{country_code.lower()}"
+    response = http_get(url, timeout=HTTP_TIMEOUT)
+    soup = bs4.BeautifulSoup(response.text, 'html.parser')
+    
+    registrar_info = {
+        "Dominio ccTLD": f".{country_code.lower()}",
+        "Registrador": "No encontrado",
+        "Información": "No encontrada"
+    }
+    
+    # Intentar extraer información del registrador
+    for div in soup.find_all('div', class_='df-raw'):
+        if "Registrar:" in div.text:
+            registrar_info["Registrador"] = div.text.replace("Registrar:", "").strip()
+        if "URL:" in div.text:
+            registrar_info["Información"] = div.text.strip()
+    
+    return registrar_info
+
 def check_phone_book(number):
     try:
         formatted_number = phonenumbers.format_number(
@@ -220,26 +368,41 @@ def check_carrier_info(number):
     except:
         return {"error": "No se pudo obtener información de la operadora"}
 
+# Mapeo simple de operadoras a sus sitios web
+CARRIER_WEBSITES = {
+    "Movistar": "https://www.movistar.es",
+    "Vodafone": "https://www.vodafone.es",
+    "Orange": "https://www.orange.es",
+    "T-Mobile": "https://www.t-mobile.com",
+    "Verizon": "https://www.verizon.com",
+    "AT&T": "https://www.att.com",
+    "Claro": "https://www.claro.com",
+    "Telcel": "https://www.telcel.com",
+    "O2": "https://www.o2.co.uk",
+    "EE": "https://ee.co.uk"
+}
+
+def build_carrier_index(websites):
+    # Índice por nombre normalizado; ante varias coincidencias gana la primera del mapeo
+    index = {}
+    for priority, (name, url) in enumerate(websites.items()):
+        index.setdefault(name.lower(), (priority, url))
+    return index, sorted({len(name) for name in index})
+
+_carrier_index, _carrier_name_lengths = build_carrier_index(CARRIER_WEBSITES)
+
+@lru_cache(maxsize=1024)
 def guess_carrier_website(carrier_name):
-    # Mapeo simple de operadoras a sus sitios web
-    carriers = {
-        "Movistar": "https://www.movistar.es",
-        "Vodafone": "https://www.vodafone.es",
-        "Orange": "https://www.orange.es",
-        "T-Mobile": "https://www.t-mobile.com",
-        "Verizon": "https://www.verizon.com",
-        "AT&T": "https://www.att.com",
-        "Claro": "https://www.claro.com",
-        "Telcel": "https://www.telcel.com",
-        "O2": "https://www.o2.co.uk",
-        "EE": "https://ee.co.uk"
-    }
-    
-    for name, url in carriers.items():
-        if name.lower() in carrier_name.lower():
-            return url
+    # Buscar cada subcadena con longitud de algún nombre conocido en el índice
+    text = carrier_name.lower()
+    best = None
+    for length in _carrier_name_lengths:
+        for start in range(len(text) - length + 1):
+            hit = _carrier_index.get(text[start:start + length])
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
     
-    return "No identificado"
+    return best[1] if best else "No identificado"
 
 def check_number_reputation(number):
     try:
@@ -260,8 +423,7 @@ def check_number_reputation(number):
         spam_reports = 0
         for service, url in services.items():
             try:
-                response = requests.get(url, timeout=5)
-                if "spam" in response.text.lower() or "scam" in response.text.lower():
+                if page_contains(url, ["spam", "scam"], timeout=5):
                     spam_reports += 1
             except:
                 continue
@@ -374,19 +536,28 @@ def save_to_file(number, data):
     
     return txt_filename, filename
 
-def parallel_check(number, functions):
+def parallel_check(number, functions, budget=NUMBER_DEADLINE):
+    """Ejecuta las verificaciones; lo que no termine dentro de `budget` segundos se marca como agotado"""
     results = {}
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {executor.submit(func, number): name for name, func in functions.items()}
-        
-        for future in futures:
-            name = futures[future]
-            try:
-                results[name] = future.result()
-                time.sleep(random.uniform(0.5, 2))  # Evitar rate limiting
-            except Exception as e:
-                results[name] = {"error": str(e)}
+    expires = time.monotonic() + budget
+    executor = ThreadPoolExecutor(max_workers=5)
+    futures = {executor.submit(func, number): name for name, func in functions.items()}
+    
+    for future in futures:
+        name = futures[future]
+        try:
+            results[name] = future.result(timeout=max(0.0, expires - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            results[name] = {"error": "Tiempo agotado antes de completar la verificación", "Tiempo_agotado": True}
+        except Exception as e:
+            results[name] = {"error": str(e)}
     
+    # No se espera a las verificaciones abandonadas; sus peticiones tienen su propio timeout.
+    # Las que aún no empezaron se cancelan a mano (cancel_futures requiere Python 3.9)
+    for future in futures:
+        future.cancel()
+    executor.shutdown(wait=False)
     return results
 
 def main():
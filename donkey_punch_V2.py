@@ -1,55 +1,1114 @@
 import re
+import sys
 import time
 import json
 import os
+import argparse
+import array
+import bisect
+import codecs
+import hashlib
+import contextvars
+import html
+import importlib
+import itertools
+import math
+import mmap
+import struct
+import threading
+import sqlite3
+import stat
 import phonenumbers
-from phonenumbers import carrier, geocoder, timezone
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
 import urllib.parse
-import requests
-from bs4 import BeautifulSoup
-import random
+from functools import lru_cache, wraps
+
+class LazyModule:
+    """Módulo que solo se importa la primera vez que se usa uno de sus atributos"""
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# Módulos pesados: solo se cargan si la ejecución los necesita
+asyncio = LazyModule("asyncio")
+requests = LazyModule("requests")
+carrier = LazyModule("phonenumbers.carrier")
+geocoder = LazyModule("phonenumbers.geocoder")
+timezone = LazyModule("phonenumbers.timezone")
+
+# Números distintos cuyo análisis se conserva en memoria
+PARSE_CACHE_SIZE = 65536
+
+GOOGLE_SEARCH_URL = "https://www.google.com/search?q={query}"
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Pools HTTP compartidos: hosts distintos en caché y conexiones keep-alive por host
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 16
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+# Máximo de bytes que se leen de una página; lo que sobra se descarta sin descargarlo
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+# Límites por host: (peticiones por segundo, ráfaga). Los hosts no listados no esperan.
+HOST_RATE_LIMITS = {
+    "www.google.com": (0.5, 2)
+}
+
+# Caché persistente de resultados (desactivada salvo --cache / enable_result_cache)
+CACHE_DIR = os.environ.get("DONKEY_PUNCH_CACHE_DIR",
+                           os.path.join(os.path.expanduser("~"), ".cache", "donkey_punch"))
+
+# Vida en caché de cada verificación en segundos. None: indefinida mientras no cambie la
+# versión de phonenumbers. Las verificaciones no listadas no se guardan: operadora y
+# reputación se calculan en menos tiempo del que cuesta leerlas de SQLite.
+CHECK_CACHE_TTL = {
+    "Información_básica": None,
+    "Búsqueda_en_Google": 2 * 24 * 3600
+}
+
+# Otros datos de los que depende el resultado guardado de una verificación, además de la
+# versión de phonenumbers (función sin argumentos que devuelve su huella): si cambian, lo
+# guardado deja de valer
+CHECK_CACHE_VERSIONS = {}
+
+RESULT_CACHE = None
+
+# Presupuesto de tiempo total por número en segundos (None = sin límite, --deadline)
+NUMBER_DEADLINE = None
+
+TIMEOUT_RESULT = {"error": "Tiempo agotado antes de completar la verificación", "Tiempo_agotado": True}
+
+_current_deadline = contextvars.ContextVar("donkey_punch_deadline", default=None)
+
+# Caducidad de los datos por región memoizados en memoria (None = toda la vida del proceso)
+REGION_CACHE_TTL = None
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def create_http_session(pool_connections=None, pool_maxsize=None):
+    """Crea una sesión requests con pools de conexiones keep-alive por host"""
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections or HTTP_POOL_CONNECTIONS,
+                          pool_maxsize=pool_maxsize or HTTP_POOL_MAXSIZE)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+def get_http_session():
+    """Sesión compartida por todos los hilos y verificaciones; reutiliza las conexiones"""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = create_http_session()
+    return _http_session
+
+# Límites (segundos) de los histogramas de duración, al estilo de Prometheus
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Archivo donde se vuelcan las métricas en cada informe de progreso y al terminar (--metrics-file)
+METRICS_FILE = None
+
+class MetricsRegistry:
+    """Contadores e histogramas en memoria, etiquetados por verificación o host
+    
+    Registrar una muestra es una búsqueda en diccionario y una bisección bajo un lock, así que
+    se puede dejar siempre activo. Se exporta como resumen JSON o en formato de texto Prometheus.
+    """
+    
+    def __init__(self, prefix="donkey_punch_", buckets=METRICS_BUCKETS):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # [cuentas por cubeta (+Inf al final), suma, total, máximo]
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0, 0.0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+            histogram[3] = max(histogram[3], value)
+    
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+    
+    def _snapshot(self):
+        with self._lock:
+            histograms = {key: (list(h[0]), h[1], h[2], h[3]) for key, h in self._histograms.items()}
+            return histograms, dict(self._counters)
+    
+    def _quantile(self, counts, total, maximum, fraction):
+        """Estimación de un percentil: límite superior de la cubeta que lo contiene"""
+        target = fraction * total
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, maximum)
+        return maximum
+    
+    def summary(self):
+        """Resumen JSON: por métrica, una entrada por combinación de etiquetas"""
+        histograms, counters = self._snapshot()
+        result = {"histogramas": {}, "contadores": {}}
+        for (name, labels), (counts, total_sum, count, maximum) in sorted(histograms.items()):
+            result["histogramas"].setdefault(name, []).append({
+                "etiquetas": dict(labels),
+                "total": count,
+                "suma": round(total_sum, 6),
+                "media": round(total_sum / count, 6),
+                "p50": round(self._quantile(counts, count, maximum, 0.50), 6),
+                "p95": round(self._quantile(counts, count, maximum, 0.95), 6),
+                "p99": round(self._quantile(counts, count, maximum, 0.99), 6),
+                "máximo": round(maximum, 6),
+            })
+        for (name, labels), value in sorted(counters.items()):
+            result["contadores"].setdefault(name, []).append({"etiquetas": dict(labels), "valor": value})
+        return result
+    
+    @staticmethod
+    def _labels_text(labels, extra=()):
+        escape = lambda value: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs = [f'{key}="{escape(value)}"' for key, value in tuple(labels) + tuple(extra)]
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+    
+    def prometheus(self):
+        """Exposición en formato de texto de Prometheus"""
+        histograms, counters = self._snapshot()
+        lines = []
+        declared = set()
+        for (name, labels), (counts, total_sum, count, _) in sorted(histograms.items()):
+            metric = self.prefix + name
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} histogram")
+                declared.add(metric)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f"{metric}_bucket{self._labels_text(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{metric}_sum{self._labels_text(labels)} {total_sum}")
+            lines.append(f"{metric}_count{self._labels_text(labels)} {count}")
+        for (name, labels), value in sorted(counters.items()):
+            metric = self.prefix + name
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f"{metric}{self._labels_text(labels)} {value}")
+        return "\n".join(lines) + "\n"
+    
+    def render(self, path):
+        """Respuesta HTTP para /metrics o /metrics.json: (cuerpo, tipo de contenido), o None"""
+        if path == "/metrics":
+            return self.prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        if path == "/metrics.json":
+            return json.dumps(self.summary(), ensure_ascii=False), "application/json"
+        return None
+    
+    def dump(self, path):
+        """Vuelca las métricas a `path`: JSON si termina en .json, si no texto Prometheus"""
+        content = (json.dumps(self.summary(), indent=4, ensure_ascii=False) if path.endswith(".json")
+                   else self.prometheus())
+        # Escritura atómica para que un lector nunca vea el archivo a medias
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temporary, path)
+
+METRICS = MetricsRegistry()
+
+def serve_metrics(port, registry=None, host="127.0.0.1"):
+    """Sirve las métricas en http://host:port/metrics (Prometheus) y /metrics.json en un hilo"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    registry = registry or METRICS
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            rendered = registry.render(self.path)
+            if rendered is None:
+                self.send_error(404)
+                return
+            body, content_type = rendered
+            body = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def instrument_check(name, func):
+    """Envuelve una verificación para registrar su espera en cola, su duración y sus errores
+    
+    La espera se cuenta desde que se envuelve (al encolarla) hasta que empieza a ejecutarse.
+    """
+    submitted = time.monotonic()
+    
+    def run(*args):
+        started = time.monotonic()
+        METRICS.observe("check_queue_seconds", started - submitted, check=name)
+        try:
+            result = func(*args)
+        except Exception:
+            METRICS.inc("check_errors_total", check=name)
+            raise
+        finally:
+            METRICS.observe("check_seconds", time.monotonic() - started, check=name)
+        if isinstance(result, dict) and "error" in result:
+            METRICS.inc("check_errors_total", check=name)
+        return result
+    
+    return run
+
+async def instrument_check_async(name, coroutine):
+    """Como instrument_check, para las verificaciones que corren en el bucle asyncio"""
+    started = time.monotonic()
+    try:
+        result = await coroutine
+    except Exception:
+        METRICS.inc("check_errors_total", check=name)
+        raise
+    finally:
+        METRICS.observe("check_seconds", time.monotonic() - started, check=name)
+    if isinstance(result, dict) and "error" in result:
+        METRICS.inc("check_errors_total", check=name)
+    return result
+
+def record_http(host, started, received=None, status=None, response=None):
+    """Registra una petición terminada: duración, bytes, reintentos y errores por host"""
+    METRICS.observe("http_request_seconds", time.monotonic() - started, host=host)
+    if received is not None:
+        METRICS.inc("http_bytes_total", received, host=host)
+    retries = getattr(getattr(getattr(response, "raw", None), "retries", None), "history", None)
+    if retries:
+        METRICS.inc("http_retries_total", len(retries), host=host)
+    if status is None or status >= 400:
+        METRICS.inc("http_errors_total", host=host)
+
+class Deadline:
+    """Presupuesto de tiempo de un número, compartido por sus verificaciones y peticiones HTTP"""
+    
+    def __init__(self, budget):
+        self.budget = budget
+        self.expires = time.monotonic() + budget
+    
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+    
+    def expired(self):
+        return time.monotonic() >= self.expires
+    
+    def timeout(self, timeout=None):
+        """Recorta `timeout` al tiempo restante; lanza TimeoutError si ya no queda"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise TimeoutError(f"Presupuesto de {self.budget:g} s agotado")
+        return remaining if timeout is None else min(timeout, remaining)
+
+def current_timeout(timeout=None):
+    """Timeout a usar en una petición, limitado por el presupuesto del número en curso"""
+    deadline = _current_deadline.get()
+    return timeout if deadline is None else deadline.timeout(timeout)
+
+def run_with_deadline(deadline, func, *args):
+    """Ejecuta `func` con `deadline` como presupuesto activo (para hilos del pool)"""
+    token = _current_deadline.set(deadline)
+    try:
+        return func(*args)
+    finally:
+        _current_deadline.reset(token)
+
+class TokenBucket:
+    """Cubo de fichas: `rate` peticiones por segundo con ráfagas de hasta `burst`"""
+    
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, max_wait=None):
+        """Reserva una ficha y devuelve los segundos que hay que esperar para usarla
+        
+        Si la espera superaría `max_wait` no se reserva nada y se devuelve None.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if max_wait is not None and delay > max_wait:
+                return None
+            self._tokens -= 1
+            return delay
+
+class HostRateLimiter:
+    """Un TokenBucket por host limitado; el resto de peticiones y los cálculos locales no esperan"""
+    
+    def __init__(self, limits=None):
+        self.limits = dict(HOST_RATE_LIMITS if limits is None else limits)
+        self._buckets = {}
+        self._lock = threading.Lock()
+    
+    def set_limit(self, host, rate, burst=1):
+        with self._lock:
+            self.limits[host] = (rate, burst)
+            self._buckets.pop(host, None)
+    
+    def bucket_for(self, url):
+        host = urllib.parse.urlsplit(url).hostname or ""
+        if host not in self.limits:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(*self.limits[host])
+            return bucket
+    
+    def wait(self, url, max_wait=None):
+        """Espera la ficha del host; TimeoutError si la espera superaría `max_wait`"""
+        bucket = self.bucket_for(url)
+        if bucket is None:
+            return 0.0
+        delay = bucket.reserve(max_wait)
+        if delay is None:
+            raise TimeoutError("El límite de velocidad del host excede el tiempo disponible")
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+    
+    async def wait_async(self, url):
+        bucket = self.bucket_for(url)
+        delay = bucket.reserve() if bucket else 0.0
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+RATE_LIMITER = HostRateLimiter()
+
+def http_get(url, **kwargs):
+    """GET por la sesión compartida respetando el límite de velocidad del host
+    
+    Si hay un presupuesto de tiempo activo, la espera y el timeout se recortan a lo que queda.
+    """
+    host = urllib.parse.urlsplit(url).hostname or ""
+    if _current_deadline.get() is not None:
+        delay = RATE_LIMITER.wait(url, max_wait=current_timeout())
+        kwargs["timeout"] = current_timeout(kwargs.get("timeout"))
+    else:
+        delay = RATE_LIMITER.wait(url)
+    if delay:
+        METRICS.observe("rate_limit_wait_seconds", delay, host=host)
+    if kwargs.get("stream"):
+        # Las descargas por trozos se registran al terminar de leerlas (stream_into)
+        return get_http_session().get(url, **kwargs)
+    
+    started = time.monotonic()
+    response = None
+    try:
+        response = get_http_session().get(url, **kwargs)
+        return response
+    finally:
+        record_http(host, started, len(response.content) if response is not None else None,
+                    response.status_code if response is not None else None, response)
+
+def configure_http_pool(pool_connections=None, pool_maxsize=None):
+    """Cambia el tamaño de los pools; las siguientes peticiones usan la sesión nueva"""
+    global _http_session, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+    with _http_session_lock:
+        HTTP_POOL_CONNECTIONS = pool_connections or HTTP_POOL_CONNECTIONS
+        HTTP_POOL_MAXSIZE = pool_maxsize or HTTP_POOL_MAXSIZE
+        _http_session = create_http_session()
+
+def memoize_by_region(ttl=None):
+    """Memoiza una función cuyo resultado solo depende de la región (y argumentos afines)
+    
+    Cada clave se calcula una sola vez aunque la pidan varios hilos a la vez; con `ttl` en
+    segundos el valor se recalcula al caducar. Los resultados son compartidos: no mutarlos.
+    """
+    def decorator(func):
+        entries = {}
+        key_locks = {}
+        lock = threading.Lock()
+        
+        def fresh(entry):
+            lifetime = REGION_CACHE_TTL if ttl is None else ttl
+            return entry is not None and (lifetime is None or time.monotonic() - entry[0] < lifetime)
+        
+        @wraps(func)
+        def wrapper(*args):
+            entry = entries.get(args)
+            if fresh(entry):
+                return entry[1]
+            with lock:
+                key_lock = key_locks.setdefault(args, threading.Lock())
+            with key_lock:
+                entry = entries.get(args)
+                if fresh(entry):
+                    return entry[1]
+                value = func(*args)
+                entries[args] = (time.monotonic(), value)
+                return value
+        
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+class AnalysisContext:
+    """Número analizado una sola vez y compartido por todas las verificaciones
+    
+    Al crearlo solo se calculan el análisis y la validez; región y formatos se calculan la
+    primera vez que se piden y quedan guardados, para que validar (y descartar) no los pague.
+    """
+    __slots__ = ("raw", "parsed", "national_digits", "is_valid", "region_code", "e164",
+                 "e164_digits", "international", "national", "rfc3966")
+    
+    LAZY_FIELDS = {
+        "region_code": lambda ctx: phonenumbers.region_code_for_number(ctx.parsed),
+        "e164": lambda ctx: phonenumbers.format_number(ctx.parsed, phonenumbers.PhoneNumberFormat.E164),
+        "e164_digits": lambda ctx: ctx.e164.replace("+", ""),
+        "international": lambda ctx: phonenumbers.format_number(ctx.parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
+        "national": lambda ctx: phonenumbers.format_number(ctx.parsed, phonenumbers.PhoneNumberFormat.NATIONAL),
+        "rfc3966": lambda ctx: phonenumbers.format_number(ctx.parsed, phonenumbers.PhoneNumberFormat.RFC3966),
+    }
+    
+    def __init__(self, raw, parsed):
+        self.raw = raw
+        self.parsed = parsed
+        self.national_digits = str(parsed.national_number)
+        self.is_valid = phonenumbers.is_valid_number(parsed)
+    
+    def __getattr__(self, name):
+        # Solo se llega aquí si el campo aún no se ha calculado
+        compute = AnalysisContext.LAZY_FIELDS.get(name)
+        if compute is None:
+            raise AttributeError(name)
+        value = compute(self)
+        setattr(self, name, value)
+        return value
+    
+    def __str__(self):
+        return self.raw
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def build_context(number):
+    """Analiza y formatea un número una vez; las repeticiones salen de la caché LRU"""
+    return AnalysisContext(number, phonenumbers.parse(number, None))
+
+def get_context(number):
+    """Acepta un número en texto o un AnalysisContext ya construido"""
+    if isinstance(number, AnalysisContext):
+        return number
+    return build_context(number)
+
+# Patrones de números sospechosos (el orden se conserva en el resultado)
+SUSPICIOUS_PATTERNS = [
+    r'(\d)\1{5,}',      # 6+ dígitos repetidos
+    r'123456\d*',        # Secuencia ascendente
+    r'654321\d*',        # Secuencia descendente
+    r'(\d{3})\1',        # Patrones repetidos (ej: 123123)
+    r'^0{5,}',           # Muchos ceros al inicio
+    r'^1{5,}',           # Muchos unos al inicio
+    r'^(\d)\d\1\d\1\d',  # Patrón alternante (ej: 121212)
+    r'^555\d{4}',        # Números ficticios (US)
+    r'^999\d{4}',        # Números ficticios (UK)
+    r'^123123',          # Patrón obvio
+    r'^321321',          # Patrón obvio inverso
+    r'^(\d{2})\1\1',     # Repetición de pares (ej: 121212)
+    r'^(\d)\1(\d)\2(\d)\3'  # Patrón AABBCC
+]
+
+# Reglas específicas por país
+COUNTRY_SPECIFIC_RISKS = {
+    "US": ["^555", "^800", "^900", "^456", "^411"],
+    "GB": ["^999", "^555", "^4479", "^4480"],
+    "ES": ["^900", "^901", "^902", "^803", "^806", "^807"],
+    "MX": ["^900", "^800", "^555", "^123"]
+}
+
+# Reglas de validate_phone_number: demasiados dígitos repetidos o secuencias simples
+IMPLAUSIBLE_REPEAT_PATTERN = r'(\d)\1{6,}'
+SIMPLE_SEQUENCES = [
+    '1234567', '2345678', '3456789', '4567890',
+    '9876543', '8765432', '7654321', '6543210'
+]
+
+def _rule_lookahead(pattern, name):
+    """Convierte un patrón en una aserción opcional con nombre para el patrón combinado"""
+    groups = iter(range(1, 100))
+    body = re.sub(r'\((?!\?)', lambda m: f"(?P<{name}_{next(groups)}>", pattern)
+    body = re.sub(r'\\(\d)', lambda m: f"(?P={name}_{m.group(1)})", body)
+    body = body[1:] if body.startswith('^') else '.*?' + body
+    return f"(?:(?=(?P<{name}>{body})))?"
+
+class ReputationRuleEngine:
+    """Reglas de reputación y plausibilidad compiladas una vez y evaluadas en una sola pasada
+    
+    Cada regla se convierte en una aserción opcional anclada al inicio del número, de modo que
+    un único `match` por número indica qué reglas se cumplen. Hay un patrón combinado por país
+    con reglas propias y uno genérico para el resto.
+    """
+    
+    def __init__(self, patterns=None, country_risks=None):
+        self.patterns = list(SUSPICIOUS_PATTERNS if patterns is None else patterns)
+        self.country_risks = dict(COUNTRY_SPECIFIC_RISKS if country_risks is None else country_risks)
+        
+        base = [(f"r{i}", pattern, 1, pattern) for i, pattern in enumerate(self.patterns)]
+        self._compiled = {None: self._compile(base)}
+        for country_code, patterns in self.country_risks.items():
+            extra = [(f"c{i}", pattern, 2, f"Específico_{country_code}:{pattern}")
+                     for i, pattern in enumerate(patterns)]
+            self._compiled[country_code] = self._compile(base + extra)
+        
+        plausibility = '|'.join(SIMPLE_SEQUENCES)
+        self._implausible = re.compile(f"{IMPLAUSIBLE_REPEAT_PATTERN}|{plausibility}")
+    
+    @staticmethod
+    def _compile(rules):
+        regex = re.compile(''.join(_rule_lookahead(pattern, name) for name, pattern, _, _ in rules))
+        return regex, [(regex.groupindex[name] - 1, weight, label) for name, _, weight, label in rules]
+    
+    def evaluate(self, national_num, country_code=None):
+        """Devuelve (factores_de_riesgo, patrones_coincidentes) para unos dígitos nacionales"""
+        regex, rules = self._compiled.get(country_code) or self._compiled[None]
+        groups = regex.match(national_num).groups()
+        risk_factors = 0
+        matched_patterns = []
+        for index, weight, label in rules:
+            if groups[index] is not None:
+                risk_factors += weight
+                matched_patterns.append(label)
+        return risk_factors, matched_patterns
+    
+    def evaluate_many(self, numbers):
+        """Evalúa un iterable de pares (dígitos_nacionales, código_de_país) de forma perezosa"""
+        evaluate = self.evaluate
+        for national_num, country_code in numbers:
+            yield evaluate(national_num, country_code)
+    
+    def is_plausible(self, national_num):
+        """Falso si el número tiene demasiados dígitos repetidos o una secuencia simple"""
+        return self._implausible.search(national_num) is None
+
+REPUTATION_ENGINE = ReputationRuleEngine()
+
+def _windows_all(mask, width):
+    """Para cada posición inicial, si las `width` columnas siguientes de `mask` son ciertas"""
+    span = mask.shape[1] - width + 1
+    result = mask[:, :span].copy()
+    for offset in range(1, width):
+        result &= mask[:, offset:offset + span]
+    return result
+
+def _contains_sequence(digits, sequence):
+    """Filas de la matriz de dígitos que contienen `sequence` en cualquier posición"""
+    return _windows_all_eq(digits, [int(d) for d in sequence]).any(axis=1)
+
+def _windows_all_eq(digits, values):
+    span = digits.shape[1] - len(values) + 1
+    result = digits[:, :span] == values[0]
+    for offset, value in enumerate(values[1:], 1):
+        result &= digits[:, offset:offset + span] == value
+    return result
+
+def _starts_with(digits, prefix):
+    return _windows_all_eq(digits[:, :len(prefix)], [int(d) for d in prefix])[:, 0]
+
+def split_e164(e164):
+    """Separa un E164 en (dígitos nacionales, regiones del prefijo) sin analizarlo con phonenumbers"""
+    digits = e164.lstrip("+")
+    if not digits.isdigit():
+        return "", ()
+    for size in (1, 2, 3):
+        regions = phonenumbers.COUNTRY_CODE_TO_REGION_CODE.get(int(digits[:size]))
+        if regions and len(digits) > size:
+            # phonenumbers guarda el número nacional como entero: sin ceros iniciales
+            return str(int(digits[size:])), regions
+    return "", ()
+
+def score_reputation_batch(e164_numbers, region_codes=None):
+    """Versión vectorizada con NumPy de check_number_reputation y las reglas de validate_phone_number
+    
+    Recibe una lista o array de números E164 canónicos (como ctx.e164) y evalúa SUSPICIOUS_PATTERNS y COUNTRY_SPECIFIC_RISKS
+    sobre una matriz de dígitos de ancho fijo. Devuelve un diccionario de arrays por fila con los
+    mismos factores de riesgo y calificación que la función escalar. Si no se indica
+    `region_codes`, los prefijos compartidos (ej: +1, +44) se resuelven con phonenumbers solo
+    cuando algún país del prefijo tiene reglas propias.
+    """
+    import numpy as np
+    
+    countries_with_rules = set(COUNTRY_SPECIFIC_RISKS)
+    nationals = []
+    regions = []
+    for row, e164 in enumerate(e164_numbers):
+        e164 = str(e164)
+        national, cc_regions = split_e164(e164)
+        region = cc_regions[0] if len(cc_regions) == 1 else None
+        if region_codes is not None:
+            region = region_codes[row]
+        elif len(cc_regions) > 1 and countries_with_rules.intersection(cc_regions):
+            try:
+                region = get_context(e164).region_code
+            except Exception:
+                region = None
+        nationals.append(national)
+        regions.append(region)
+    
+    size = len(nationals)
+    width = max([7] + [len(n) for n in nationals])
+    # Matriz de dígitos: -1 en las posiciones de relleno
+    raw = np.array(nationals, dtype=f"S{width}").view(np.uint8).reshape(size, width)
+    digits = np.where(raw == 0, -1, raw.astype(np.int16) - 48)
+    lengths = (raw != 0).sum(axis=1)
+    valid = digits >= 0
+    regions = np.array(regions, dtype=object)
+    
+    def column(index):
+        return digits[:, index]
+    
+    def long_enough(n):
+        return lengths >= n
+    
+    equal_next = (digits[:, :-1] == digits[:, 1:]) & valid[:, 1:]
+    repeat3 = (digits[:, :-3] == digits[:, 3:]) & valid[:, 3:]
+    
+    # Mismo orden que SUSPICIOUS_PATTERNS
+    pattern_hits = np.column_stack([
+        _windows_all(equal_next, 5).any(axis=1),                                  # (\d)\1{5,}
+        _contains_sequence(digits, "123456"),                                      # 123456\d*
+        _contains_sequence(digits, "654321"),                                      # 654321\d*
+        _windows_all(repeat3, 3).any(axis=1),                                      # (\d{3})\1
+        _starts_with(digits, "00000"),                                             # ^0{5,}
+        _starts_with(digits, "11111"),                                             # ^1{5,}
+        long_enough(6) & (column(0) == column(2)) & (column(0) == column(4)),      # ^(\d)\d\1\d\1\d
+        _starts_with(digits, "555") & long_enough(7),                              # ^555\d{4}
+        _starts_with(digits, "999") & long_enough(7),                              # ^999\d{4}
+        _starts_with(digits, "123123"),                                            # ^123123
+        _starts_with(digits, "321321"),                                            # ^321321
+        long_enough(6) & (column(0) == column(2)) & (column(0) == column(4))
+        & (column(1) == column(3)) & (column(1) == column(5)),                     # ^(\d{2})\1\1
+        long_enough(6) & (column(0) == column(1)) & (column(2) == column(3))
+        & (column(4) == column(5)),                                                # ^(\d)\1(\d)\2(\d)\3
+    ])
+    risk_factors = pattern_hits.sum(axis=1).astype(np.int64)
+    
+    country_hits = {}
+    for country_code, patterns in COUNTRY_SPECIFIC_RISKS.items():
+        in_country = regions == country_code
+        hits = np.column_stack([in_country & _starts_with(digits, pattern.lstrip("^")) for pattern in patterns])
+        country_hits[country_code] = hits
+        risk_factors += 2 * hits.sum(axis=1)
+    
+    implausible = _windows_all(equal_next, 6).any(axis=1)
+    for sequence in SIMPLE_SEQUENCES:
+        implausible |= _contains_sequence(digits, sequence)
+    
+    ratings = np.select([risk_factors > 3, risk_factors > 2, risk_factors > 1],
+                        ["Muy Alta", "Alta", "Media"], default="Baja").astype(object)
+    
+    return {
+        "Factores_de_riesgo": risk_factors,
+        "Calificación_de_reputación": ratings,
+        "Patrones": pattern_hits,
+        "Patrones_por_país": country_hits,
+        "Regiones": regions,
+        "Plausible": ~implausible & (lengths > 0)
+    }
+
+def reputation_report(risk_factors, matched_patterns):
+    """Construye el resultado de check_number_reputation a partir de los factores de riesgo"""
+    # Evaluar reputación basada en factores
+    reputation = "Baja"
+    if risk_factors > 3:
+        reputation = "Muy Alta"
+    elif risk_factors > 2:
+        reputation = "Alta"
+    elif risk_factors > 1:
+        reputation = "Media"
+    
+    return {
+        "Factores_de_riesgo": risk_factors,
+        "Patrones_sospechosos": matched_patterns if matched_patterns else "Ninguno detectado",
+        "Calificación_de_reputación": reputation,
+        "Recomendación": "Extrema precaución" if risk_factors > 3 else 
+                        "Precaución" if risk_factors > 1 else 
+                        "Parece legítimo",
+        "Notas": "Números con patrones repetitivos o secuenciales son comúnmente usados para spam/fraude" if risk_factors > 0 else ""
+    }
+
 def validate_phone_number(number):
     """Valida el número telefónico con mayor precisión"""
     try:
-        parsed_number = phonenumbers.parse(number, None)
-        if not phonenumbers.is_valid_number(parsed_number):
+        ctx = get_context(number)
+        if not ctx.is_valid:
             return False
         
-        # Validación adicional basada en patrones
-        national_num = str(parsed_number.national_number)
-        
-        # Rechazar números con demasiados dígitos repetidos
-        if re.search(r'(\d)\1{6,}', national_num):
-            return False
-            
-        # Rechazar secuencias simples
-        simple_sequences = [
-            '1234567', '2345678', '3456789', '4567890',
-            '9876543', '8765432', '7654321', '6543210'
-        ]
-        if any(seq in national_num for seq in simple_sequences):
-            return False
-            
-        return True
+        # Rechazar dígitos repetidos y secuencias simples
+        return REPUTATION_ENGINE.is_plausible(ctx.national_digits)
     except:
         return False
 
+# Índice de prefijos precompilado (--prefix-index); None = consultas directas a phonenumbers
+PREFIX_INDEX = None
+
+PREFIX_INDEX_MAGIC = b"DPPREFX1"
+
+# Dígitos a los que se rellenan números y prefijos E164 para compararlos como enteros
+PREFIX_INDEX_WIDTH = 15
+
+_NO_ENTRY = 0xFFFFFFFF
+
+UNKNOWN_TIME_ZONES = ("Etc/Unknown",)
+
+# Tipos de número para los que phonenumbers devuelve operadora
+CARRIER_NUMBER_TYPES = frozenset([
+    phonenumbers.PhoneNumberType.MOBILE,
+    phonenumbers.PhoneNumberType.FIXED_LINE_OR_MOBILE,
+    phonenumbers.PhoneNumberType.PAGER
+])
+
+def build_prefix_index(path, regions=None, language="es"):
+    """Compila las tablas de operadoras, geolocalización y zonas horarias de phonenumbers en `path`
+    
+    Los prefijos de las tres tablas se convierten en rangos de enteros de PREFIX_INDEX_WIDTH
+    dígitos y se aplanan en rangos disjuntos, cada uno con su operadora, zona y zonas horarias
+    (las del prefijo más largo que lo contiene). Con `regions` solo se incluyen esos países.
+    """
+    from phonenumbers.prefix import _find_lang
+    from phonenumbers.carrierdata import CARRIER_DATA
+    from phonenumbers.geodata import GEOCODE_DATA
+    from phonenumbers.geodata.locale import LOCALE_DATA
+    from phonenumbers.tzdata import TIMEZONE_DATA
+    
+    country_codes = None
+    if regions:
+        country_codes = {str(phonenumbers.country_code_for_region(region.upper())) for region in regions} - {"0"}
+    
+    def covered(prefix):
+        return country_codes is None or any(prefix[:size] in country_codes for size in (1, 2, 3))
+    
+    def localized(data):
+        table = {}
+        for prefix, names in data.items():
+            if covered(prefix):
+                name = _find_lang(names, language, None, None)
+                if name is not None:
+                    table[prefix] = name
+        return table
+    
+    tables = [
+        localized(CARRIER_DATA),
+        localized(GEOCODE_DATA),
+        {prefix: "&".join(zones) for prefix, zones in TIMEZONE_DATA.items() if covered(prefix)}
+    ]
+    
+    width = PREFIX_INDEX_WIDTH
+    limit = 10 ** width
+    bounds = {0}
+    for table in tables:
+        for prefix in table:
+            scale = 10 ** (width - len(prefix))
+            bounds.add(int(prefix) * scale)
+            bounds.add((int(prefix) + 1) * scale)
+    lengths = [sorted({len(prefix) for prefix in table}, reverse=True) for table in tables]
+    
+    strings = {}
+    starts = array.array('q')
+    columns = [array.array('I'), array.array('I'), array.array('I')]
+    required = array.array('B')
+    previous = None
+    for start in sorted(bound for bound in bounds if bound < limit):
+        digits = str(start).zfill(width)
+        row = []
+        longest = 0
+        for table, sizes in zip(tables, lengths):
+            for size in sizes:
+                value = table.get(digits[:size])
+                if value is not None:
+                    row.append(strings.setdefault(value, len(strings)))
+                    longest = max(longest, size)
+                    break
+            else:
+                row.append(_NO_ENTRY)
+        row.append(longest)
+        # Rangos contiguos con los mismos datos se unen en uno
+        if row != previous:
+            starts.append(start)
+            for column, value in zip(columns, row):
+                column.append(value)
+            required.append(longest)
+            previous = row
+    
+    pool = bytearray()
+    offsets = array.array('I', [0])
+    for text in strings:
+        pool += text.encode('utf-8')
+        offsets.append(len(pool))
+    
+    # Idiomas en los que la operadora coincide con la de `language` (casi todas solo tienen "en")
+    carrier_languages = [lang for lang in dict.fromkeys([language, "en", "es"])
+                         if all(_find_lang(names, lang, None, None) == _find_lang(names, language, None, None)
+                                for prefix, names in CARRIER_DATA.items() if covered(prefix))]
+    meta = {
+        "phonenumbers": phonenumbers.__version__,
+        "language": language,
+        "country_codes": sorted(int(code) for code in country_codes) if country_codes is not None else None,
+        "width": width,
+        "rows": len(starts),
+        "strings": len(strings),
+        "carrier_languages": carrier_languages,
+        # Países con token móvil cuya zona se busca quitando el token (geocoder usa ahí su región como locale)
+        "mobile_token_codes": [
+            code for code in phonenumbers.COUNTRY_CODE_TO_REGION_CODE
+            if phonenumbers.country_mobile_token(code) and not any(
+                f"{language}_{phonenumbers.region_code_for_country_code(code)}" in names
+                for prefix, names in GEOCODE_DATA.items() if prefix.startswith(str(code)))
+        ],
+        "region_names": {region: geocoder._region_display_name(region, language) for region in LOCALE_DATA},
+        "country_time_zones": {
+            str(code): "&".join(timezone._country_level_time_zones_for_number(phonenumbers.PhoneNumber(country_code=code)))
+            for code in phonenumbers.COUNTRY_CODE_TO_REGION_CODE
+        }
+    }
+    header = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(PREFIX_INDEX_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * (-f.tell() % 8))
+        f.write(starts.tobytes())
+        for column in columns:
+            f.write(column.tobytes())
+        f.write(required.tobytes())
+        f.write(b"\0" * (-f.tell() % 4))
+        f.write(offsets.tobytes())
+        f.write(pool)
+    os.replace(tmp_path, path)
+    return path
+
+class PrefixIndex:
+    """Índice de prefijos compilado por build_prefix_index, mapeado en memoria
+    
+    Una búsqueda binaria sobre los inicios de rango responde a la vez operadora, zona y zonas
+    horarias. Los textos se decodifican al pedirlos; las páginas del archivo las comparte el
+    sistema operativo entre todos los procesos que lo abren.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if view[:8] != PREFIX_INDEX_MAGIC:
+            raise ValueError(f"{path} no es un índice de prefijos")
+        header_size, = struct.unpack_from("<I", self._map, 8)
+        self.meta = json.loads(bytes(view[12:12 + header_size]))
+        if self.meta["phonenumbers"] != phonenumbers.__version__:
+            raise ValueError(f"{path} se generó con phonenumbers {self.meta['phonenumbers']}")
+        
+        rows = self.meta["rows"]
+        offset = 12 + header_size + (-(12 + header_size) % 8)
+        self._starts = view[offset:offset + 8 * rows].cast('q')
+        offset += 8 * rows
+        self._carriers, self._areas, self._time_zones = (
+            view[offset + 4 * rows * i:offset + 4 * rows * (i + 1)].cast('I') for i in range(3))
+        offset += 12 * rows
+        self._required = view[offset:offset + rows]
+        offset += rows + (-(offset + rows) % 4)
+        count = self.meta["strings"] + 1
+        self._offsets = view[offset:offset + 4 * count].cast('I')
+        self._pool = view[offset + 4 * count:]
+        
+        self.language = self.meta["language"]
+        self.width = self.meta["width"]
+        self.country_codes = set(self.meta["country_codes"]) if self.meta["country_codes"] is not None else None
+        self.carrier_languages = set(self.meta["carrier_languages"])
+        self.mobile_token_codes = set(self.meta["mobile_token_codes"])
+        self.region_names = self.meta["region_names"]
+        self.country_time_zones = {int(code): tuple(zones.split("&"))
+                                   for code, zones in self.meta["country_time_zones"].items()}
+        self._texts = {}
+    
+    def __reduce__(self):
+        # Los procesos del pool vuelven a mapear el archivo en lugar de recibir su contenido
+        return PrefixIndex, (self.path,)
+    
+    def text(self, string_id):
+        if string_id == _NO_ENTRY:
+            return None
+        text = self._texts.get(string_id)
+        if text is None:
+            text = str(self._pool[self._offsets[string_id]:self._offsets[string_id + 1]], 'utf-8')
+            self._texts[string_id] = text
+        return text
+    
+    def find(self, digits):
+        """Fila del rango que contiene los dígitos E164, o None si un prefijo es más largo que el número"""
+        if len(digits) > self.width:
+            return None
+        row = bisect.bisect_right(self._starts, int(digits) * 10 ** (self.width - len(digits))) - 1
+        if self._required[row] > len(digits):
+            return None
+        return row
+    
+    def country_name(self, parsed):
+        """Como geocoder.country_name_for_number, con los nombres ya resueltos"""
+        region_codes = phonenumbers.region_codes_for_country_code(parsed.country_code)
+        if len(region_codes) == 1:
+            return self.region_names.get(region_codes[0], "")
+        found = "ZZ"
+        for region_code in region_codes:
+            if phonenumbers.is_valid_number_for_region(parsed, region_code):
+                if found != "ZZ":
+                    return ""
+                found = region_code
+        return self.region_names.get(found, "")
+    
+    def area(self, parsed, row):
+        """Zona de un número geográfico; los móviles con token (Argentina) se buscan sin él"""
+        mobile_token = phonenumbers.country_mobile_token(parsed.country_code)
+        if mobile_token:
+            national_number = phonenumbers.national_significant_number(parsed)
+            if national_number.startswith(mobile_token):
+                if parsed.country_code not in self.mobile_token_codes:
+                    return None
+                try:
+                    stripped = phonenumbers.parse(national_number[len(mobile_token):],
+                                                  phonenumbers.region_code_for_country_code(parsed.country_code))
+                except phonenumbers.NumberParseException:
+                    stripped = parsed
+                row = self.find(phonenumbers.format_number(stripped, phonenumbers.PhoneNumberFormat.E164)[1:])
+                if row is None:
+                    return None
+        return self.text(self._areas[row]) or self.country_name(parsed)
+    
+    def describe(self, ctx, number_type=None, language=None):
+        """(zona o país, operadora, zonas horarias) como geocoder, carrier y timezone de phonenumbers
+        
+        Cada valor que el índice no puede responder (otro idioma, país no incluido, prefijo más
+        largo que el número) sale como None para consultarlo aparte.
+        """
+        language = language or self.language
+        parsed = ctx.parsed
+        code = parsed.country_code
+        if self.country_codes is not None and code not in self.country_codes:
+            return None, None, None
+        if number_type is None:
+            number_type = phonenumbers.number_type(parsed)
+        if number_type == phonenumbers.PhoneNumberType.UNKNOWN:
+            return "", "", UNKNOWN_TIME_ZONES
+        row = self.find(ctx.e164_digits)
+        if row is None:
+            return None, None, None
+        
+        carrier_name = None
+        if language in self.carrier_languages:
+            carrier_name = (self.text(self._carriers[row]) or "") if number_type in CARRIER_NUMBER_TYPES else ""
+        
+        area = None
+        geographical = phonenumbers.is_number_type_geographical(number_type, code)
+        if geographical:
+            zones = self.text(self._time_zones[row])
+            time_zones = tuple(zones.split("&")) if zones else UNKNOWN_TIME_ZONES
+            if language == self.language:
+                area = self.area(parsed, row)
+        else:
+            time_zones = self.country_time_zones.get(code, UNKNOWN_TIME_ZONES)
+            if language == self.language:
+                area = self.country_name(parsed)
+        return area, carrier_name, time_zones
+
+def enable_prefix_index(directory=None, regions=None, language="es"):
+    """Usa el índice de prefijos de `directory` para estas regiones, compilándolo si no existe
+    
+    El nombre del archivo incluye la versión de phonenumbers, así que al actualizarla se
+    compila uno nuevo en lugar de usar datos desfasados. La compilación usa funciones internas
+    de phonenumbers: si una versión nueva las cambia, se avisa y se sigue sin índice (None).
+    """
+    global PREFIX_INDEX
+    directory = directory or CACHE_DIR
+    os.makedirs(directory, exist_ok=True)
+    scope = "todas"
+    if regions:
+        scope = hashlib.blake2b(",".join(sorted(region.upper() for region in regions)).encode(),
+                                digest_size=4).hexdigest()
+    path = os.path.join(directory, f"prefijos-{phonenumbers.__version__}-{language}-{scope}.idx")
+    if not os.path.exists(path):
+        try:
+            build_prefix_index(path, regions, language)
+        except (ImportError, AttributeError) as e:
+            print(f"Aviso: no se pudo compilar el índice de prefijos con phonenumbers "
+                  f"{phonenumbers.__version__} ({e}); se consulta phonenumbers directamente", file=sys.stderr)
+            PREFIX_INDEX = None
+            return None
+    PREFIX_INDEX = PrefixIndex(path)
+    return PREFIX_INDEX
+
+def prefix_lookup(ctx, number_type=None, language="es"):
+    """(zona, operadora, zonas horarias) desde el índice de prefijos; None donde no responde"""
+    if PREFIX_INDEX is None:
+        return None, None, None
+    return PREFIX_INDEX.describe(ctx, number_type, language)
+
 def get_basic_info(number):
     """Obtiene información básica mejorada con datos específicos por país"""
     try:
-        parsed_number = phonenumbers.parse(number, None)
-        if not phonenumbers.is_valid_number(parsed_number):
+        ctx = get_context(number)
+        if not ctx.is_valid:
             return {"error": "Número no válido"}
         
-        country_code = phonenumbers.region_code_for_number(parsed_number)
-        country_name = geocoder.description_for_number(parsed_number, "es") or "Desconocido"
-        carrier_name = carrier.name_for_number(parsed_number, "es") or "Desconocida"
+        parsed_number = ctx.parsed
+        country_code = ctx.region_code
+        number_type = phonenumbers.number_type(parsed_number)
+        area, carrier_name, time_zones = prefix_lookup(ctx, number_type, "es")
+        if area is None:
+            area = geocoder.description_for_number(parsed_number, "es")
+        if carrier_name is None:
+            carrier_name = carrier.name_for_number(parsed_number, "es")
+        if time_zones is None:
+            time_zones = timezone.time_zones_for_number(parsed_number)
+        country_name = area or "Desconocido"
+        carrier_name = carrier_name or "Desconocida"
         
         # Mapeo extendido de tipos de número
         number_type_map = {
@@ -71,14 +1130,14 @@ def get_basic_info(number):
         }
         
         basic_info = {
-            "Número formateado": phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
+            "Número formateado": ctx.international,
             "País": country_name,
             "Código de país": country_code,
             "Operadora": carrier_name,
-            "Zona horaria": timezone.time_zones_for_number(parsed_number),
+            "Zona horaria": time_zones,
             "Es posible número": phonenumbers.is_possible_number(parsed_number),
-            "Es válido número": phonenumbers.is_valid_number(parsed_number),
-            "Tipo de número": number_type_map.get(phonenumbers.number_type(parsed_number), "Desconocido"),
+            "Es válido número": ctx.is_valid,
+            "Tipo de número": number_type_map.get(number_type, "Desconocido"),
             "Código nacional": parsed_number.national_number,
             "Código de área": get_area_code(parsed_number, country_code),
             "Línea": get_line_number(parsed_number, country_code),
@@ -118,14 +1177,22 @@ def get_country_specific_info(parsed_number, country_code):
         info["Formato local"] = local_formats[country_code]
     
     # Información adicional por país
+    notes = get_country_notes(country_code)
+    if notes:
+        info["Notas"] = notes
+    
+    return info
+
+@memoize_by_region()
+def get_country_notes(country_code):
+    """Notas sobre el plan de numeración del país"""
     if country_code == "US":
-        info["Notas"] = "Código de área de 3 dígitos, número local de 7 dígitos"
+        return "Código de área de 3 dígitos, número local de 7 dígitos"
     elif country_code == "ES":
-        info["Notas"] = "Prefijo provincial de 3 dígitos, número local de 6 dígitos"
+        return "Prefijo provincial de 3 dígitos, número local de 6 dígitos"
     elif country_code == "MX":
-        info["Notas"] = "LADA de 3 dígitos, número local de 7 u 8 dígitos"
-    
-    return info
+        return "LADA de 3 dígitos, número local de 7 u 8 dígitos"
+    return None
 
 def get_area_code(parsed_number, country_code):
     """Obtiene el código de área con mayor precisión"""
@@ -189,21 +1256,182 @@ def get_local_format(parsed_number, country_code):
     
     return formats.get(country_code, phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.NATIONAL))
 
+def google_search_queries(ctx):
+    """Formatos del número a buscar en Google con su consulta numérica asociada"""
+    formats = [
+        ctx.e164_digits,
+        ctx.international,
+        ctx.national,
+        ctx.rfc3966,
+        ctx.national_digits,
+        ctx.national_digits[-7:]  # Últimos 7 dígitos
+    ]
+    
+    # Eliminar duplicados
+    formats = list(set(formats))
+    
+    queries = []
+    for num_format in formats:
+        clean_num = re.sub(r'[^0-9]', '', num_format)
+        if clean_num:
+            queries.append((num_format, clean_num, GOOGLE_SEARCH_URL.format(query=urllib.parse.quote(clean_num))))
+    return formats, queries
+
+# Tokens HTML mínimos para recorrer una página sin construir el DOM
+_TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z][^\s/>]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+_TAG_PREFIX_PATTERN = re.compile(r'<(?:/?(?:[a-zA-Z][^\s/>]*(?:[^>"\']|"[^"]*"|\'[^\']*\')*(?:"[^"]*|\'[^\']*)?)?)?\Z')
+_ATTR_PATTERN = re.compile(r'([^\s=/>"\']+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+_RAW_TEXT_END = {
+    "script": re.compile(r'</\s*script\s*>', re.I),
+    "style": re.compile(r'</\s*style\s*>', re.I)
+}
+_GOOGLE_LINK_SUFFIX = re.compile(r'&sa=.*')
+# Una etiqueta incompleta más larga que esto se da por mal formada en lugar de esperar más datos
+_MAX_TAG_LENGTH = 65536
+
+class GoogleResultExtractor:
+    """Extrae enlaces y cuenta menciones de una página de Google a medida que llega
+    
+    Recibe el cuerpo por trozos con feed() y en una sola pasada cuenta las apariciones de
+    `clean_num` (igual que str.count sobre la página completa) y recoge los href de las
+    etiquetas <a>, ignorando comentarios y el contenido de <script> y <style>. Los enlaces
+    se filtran y limpian igual que en la versión con BeautifulSoup.
+    """
+    
+    def __init__(self, clean_num):
+        self.clean_num = clean_num
+        self.mentions = 0
+        self.links = []
+        self._text_tail = ""
+        self._markup = ""
+        self._raw_end = None
+        self._in_comment = False
+    
+    def feed(self, chunk):
+        self._count_mentions(chunk)
+        self._scan(self._markup + chunk)
+        return True
+    
+    def close(self):
+        self._markup = ""
+        return self
+    
+    def _count_mentions(self, chunk):
+        # Conteo sin solapamientos que continúa entre trozos
+        needle = self.clean_num
+        text = self._text_tail + chunk
+        pos = 0
+        while True:
+            found = text.find(needle, pos)
+            if found < 0:
+                break
+            self.mentions += 1
+            pos = found + len(needle)
+        self._text_tail = text[max(pos, len(text) - len(needle) + 1):]
+    
+    def _scan(self, buffer):
+        pos = 0
+        end = len(buffer)
+        while pos < end:
+            if self._in_comment:
+                close = buffer.find("-->", pos)
+                if close < 0:
+                    self._markup = buffer[max(pos, end - 2):]
+                    return
+                pos = close + 3
+                self._in_comment = False
+                continue
+            
+            if self._raw_end is not None:
+                match = self._raw_end.search(buffer, pos)
+                if match is None:
+                    # Conservar lo justo para detectar un cierre partido entre trozos
+                    self._markup = buffer[max(pos, end - 32):]
+                    return
+                pos = match.end()
+                self._raw_end = None
+                continue
+            
+            start = buffer.find("<", pos)
+            if start < 0:
+                break
+            if buffer.startswith("<!--", start):
+                self._in_comment = True
+                pos = start + 4
+                continue
+            
+            match = _TAG_PATTERN.match(buffer, start)
+            if match is None:
+                incomplete = buffer.find(">", start) < 0 or _TAG_PREFIX_PATTERN.match(buffer, start)
+                if incomplete and end - start < _MAX_TAG_LENGTH:
+                    # Etiqueta incompleta: esperar al siguiente trozo
+                    self._markup = buffer[start:]
+                    return
+                pos = start + 1
+                continue
+            
+            closing, name, attrs = match.groups()
+            name = name.lower()
+            if not closing:
+                if name == "a":
+                    self._add_link(attrs)
+                elif name in _RAW_TEXT_END and not attrs.rstrip().endswith("/"):
+                    self._raw_end = _RAW_TEXT_END[name]
+            pos = match.end()
+        self._markup = ""
+    
+    def _add_link(self, attrs):
+        href = None
+        for attr in _ATTR_PATTERN.finditer(attrs):
+            if attr.group(1).lower() == "href":
+                value = next((v for v in attr.group(2, 3, 4) if v is not None), "")
+                href = html.unescape(value)
+        if href and "http" in href and not any(x in href for x in ["google.com", "youtube.com"]):
+            clean_link = _GOOGLE_LINK_SUFFIX.sub('', href.replace("/url?q=", ""))
+            self.links.append(urllib.parse.unquote(clean_link))
+
+def add_google_results(results, num_format, extractor):
+    """Acumula en `results` las menciones y enlaces de una página ya procesada"""
+    results["Menciones"] += extractor.mentions
+    results["Resultados_por_formato"][num_format] = extractor.mentions
+    results["Enlaces relacionados"].update(extractor.links)
+
+def stream_into(url, sink, timeout=10, chunk_size=16384, max_bytes=None):
+    """Descarga `url` por trozos y los entrega decodificados a `sink.feed` sin guardar el cuerpo
+    
+    La descarga se corta si `sink.feed` devuelve False o al superar `max_bytes`
+    (MAX_BODY_BYTES por defecto). Las respuestas de error (429, 5xx...) lanzan HTTPError sin
+    pasar el cuerpo a `sink`.
+    """
+    max_bytes = max_bytes or MAX_BODY_BYTES
+    received = 0
+    status = None
+    response = None
+    started = time.monotonic()
+    try:
+        response = http_get(url, timeout=timeout, stream=True)
+        with response:
+            status = response.status_code
+            response.raise_for_status()
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            for chunk in response.iter_content(chunk_size):
+                received += len(chunk)
+                if sink.feed(decoder.decode(chunk)) is False or received >= max_bytes:
+                    break
+                current_timeout()
+            else:
+                sink.feed(decoder.decode(b"", final=True))
+            status = response.status_code
+    finally:
+        record_http(urllib.parse.urlsplit(url).hostname or "", started, received, status, response)
+    sink.close()
+    return response
+
 def check_google_search(number):
     """Búsqueda en Google mejorada con múltiples formatos"""
     try:
-        parsed = phonenumbers.parse(number, None)
-        formats = [
-            phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164).replace("+", ""),
-            phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
-            phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL),
-            phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.RFC3966),
-            str(parsed.national_number),
-            str(parsed.national_number)[-7:]  # Últimos 7 dígitos
-        ]
-        
-        # Eliminar duplicados
-        formats = list(set(formats))
+        ctx = get_context(number)
+        formats, queries = google_search_queries(ctx)
         
         results = {
             "Enlaces relacionados": set(),
@@ -212,35 +1440,12 @@ def check_google_search(number):
             "Resultados_por_formato": {}
         }
         
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        
         # Buscar cada formato del número
-        for num_format in formats:
-            clean_num = re.sub(r'[^0-9]', '', num_format)
-            if not clean_num:
-                continue
-                
-            url = f"https://www.google.com/search?q={urllib.parse.quote(clean_num)}"
-            
+        for num_format, clean_num, url in queries:
             try:
-                response = requests.get(url, headers=headers, timeout=10)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Contar menciones
-                mentions = response.text.count(clean_num)
-                results["Menciones"] += mentions
-                results["Resultados_por_formato"][num_format] = mentions
-                
-                # Extraer enlaces
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    if "http" in href and not any(x in href for x in ["google.com", "youtube.com"]):
-                        clean_link = re.sub(r'&sa=.*', '', href.replace("/url?q=", ""))
-                        results["Enlaces relacionados"].add(urllib.parse.unquote(clean_link))
-                
-                time.sleep(random.uniform(1, 3))  # Evitar rate limiting
+                extractor = GoogleResultExtractor(clean_num)
+                stream_into(url, extractor, timeout=10)
+                add_google_results(results, num_format, extractor)
             except Exception as e:
                 results["Resultados_por_formato"][num_format] = f"Error: {str(e)}"
                 continue
@@ -253,9 +1458,8 @@ def check_google_search(number):
 def check_social_media(number):
     """Genera enlaces para buscar en redes sociales"""
     try:
-        parsed = phonenumbers.parse(number, None)
-        clean_num = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164).replace("+", "")
-        national_num = str(parsed.national_number)
+        ctx = get_context(number)
+        clean_num = ctx.e164_digits
         
         social_media = {
             "Facebook": f"https://www.facebook.com/login/identify/?ctx=recover&phone={clean_num}",
@@ -274,154 +1478,164 @@ def check_social_media(number):
     except Exception as e:
         return {"error": f"No se pudo generar enlaces: {str(e)}"}
 
+# Base de datos local de operadoras. "alias" (opcional) añade nombres alternativos.
+CARRIERS_DB = {
+    "Movistar": {
+        "países": ["ES", "AR", "CL", "PE", "CO", "EC", "UY", "VE"],
+        "sitio": "movistar.{tld}",
+        "tld": {"ES": "es", "AR": "com.ar", "CL": "cl", "PE": "pe", "CO": "co", "EC": "ec", "UY": "com.uy", "VE": "com.ve"},
+        "tipo": ["Móvil", "Fijo", "Internet"]
+    },
+    "Vodafone": {
+        "países": ["ES", "GB", "DE", "IT", "PT", "IE", "NL", "GR"],
+        "sitio": "vodafone.{tld}",
+        "tld": {"ES": "es", "GB": "co.uk", "DE": "de", "IT": "it", "PT": "pt", "IE": "ie", "NL": "nl", "GR": "gr"},
+        "tipo": ["Móvil", "Fijo", "Internet"]
+    },
+    "Claro": {
+        "países": ["BR", "MX", "AR", "CO", "CL", "PE", "EC", "DO", "PA", "NI", "GT", "SV", "HN", "CR"],
+        "sitio": "claro{tld}",
+        "tld": {"BR": ".com.br", "MX": ".com.mx", "AR": ".com.ar", "CO": ".com.co", "CL": ".cl", "PE": ".pe", "EC": ".com.ec"},
+        "tipo": ["Móvil", "Fijo", "Internet", "TV"]
+    },
+    "T-Mobile": {
+        "países": ["US", "DE", "PL", "CZ", "HU", "AT", "NL"],
+        "sitio": "t-mobile.{tld}",
+        "tld": {"US": "com", "DE": "de", "PL": "pl", "CZ": "cz", "HU": "hu", "AT": "at", "NL": "nl"},
+        "tipo": ["Móvil", "Internet"]
+    },
+    "AT&T": {
+        "países": ["US", "MX"],
+        "sitio": "att.{tld}",
+        "tld": {"US": "com", "MX": "com.mx"},
+        "tipo": ["Móvil", "Fijo", "Internet", "TV"]
+    },
+    "Verizon": {
+        "países": ["US"],
+        "sitio": "verizon.com",
+        "tipo": ["Móvil", "Fijo", "Internet", "TV"]
+    },
+    "Orange": {
+        "países": ["ES", "FR", "PL", "BE", "RO", "SK", "MD"],
+        "sitio": "orange.{tld}",
+        "tld": {"ES": "es", "FR": "fr", "PL": "pl", "BE": "be", "RO": "ro", "SK": "sk", "MD": "md"},
+        "tipo": ["Móvil", "Fijo", "Internet", "TV"]
+    }
+}
+
+def normalize_carrier_name(name):
+    return name.lower()
+
+class CarrierIndex:
+    """Índice precalculado de operadoras: alias normalizados y sitio web por (operadora, región)
+    
+    La búsqueda recorre las subcadenas del nombre recibido con las longitudes de alias
+    existentes y las consulta en un diccionario, así que su coste depende de la longitud del
+    nombre y no del número de operadoras. Si coinciden varias, gana la primera de la base.
+    """
+    
+    def __init__(self, carriers):
+        self.carriers = carriers
+        self._aliases = {}
+        self._websites = {}
+        self._default_websites = {}
+        self._details = {}
+        
+        for priority, (name, data) in enumerate(carriers.items()):
+            for alias in [name] + list(data.get("alias", [])):
+                alias = normalize_carrier_name(alias)
+                if alias and (alias not in self._aliases or self._aliases[alias][0] > priority):
+                    self._aliases[alias] = (priority, name)
+            
+            # Construir URL del sitio web por región
+            for region, tld in data.get("tld", {}).items():
+                self._websites[(name, region)] = "https://www." + data["sitio"].format(tld=tld)
+            self._default_websites[name] = "https://www." + data["sitio"].format(tld="com")
+            self._details[name] = (data["países"], data["tipo"])
+        
+        self._alias_lengths = sorted({len(alias) for alias in self._aliases})
+    
+    @classmethod
+    def from_file(cls, path):
+        """Carga la base desde un JSON con el mismo formato que CARRIERS_DB"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+    
+    def match(self, carrier_name):
+        """Nombre canónico de la primera operadora cuyo alias aparece en `carrier_name`"""
+        text = normalize_carrier_name(carrier_name)
+        best = None
+        for length in self._alias_lengths:
+            if length > len(text):
+                break
+            for start in range(len(text) - length + 1):
+                hit = self._aliases.get(text[start:start + length])
+                if hit is not None and (best is None or hit[0] < best[0]):
+                    best = hit
+        return best[1] if best else None
+    
+    def website(self, name, country_code):
+        return self._websites.get((name, country_code)) or self._default_websites[name]
+    
+    def lookup(self, carrier_name, country_code):
+        """Datos de la operadora para check_carrier_info"""
+        name = self.match(carrier_name)
+        if name is None:
+            return {"Identificada_en_BD": False}
+        
+        countries, services = self._details[name]
+        return {
+            "Sitio web oficial": self.website(name, country_code),
+            "Países de operación": countries,
+            "Servicios ofrecidos": services,
+            "Identificada_en_BD": True
+        }
+
+CARRIER_INDEX = CarrierIndex(CARRIERS_DB)
+
+def load_carrier_index(path):
+    """Sustituye la base de operadoras por la de un archivo JSON"""
+    global CARRIER_INDEX
+    CARRIER_INDEX = CarrierIndex.from_file(path)
+    resolve_carrier.cache_clear()
+    return CARRIER_INDEX
+
 def check_carrier_info(number):
     """Información detallada de la operadora con base de datos local"""
     try:
-        parsed_number = phonenumbers.parse(number, None)
-        carrier_name = carrier.name_for_number(parsed_number, "en") or "Desconocida"
-        country_code = phonenumbers.region_code_for_number(parsed_number)
-        
-        # Base de datos local de operadoras
-        carriers_db = {
-            "Movistar": {
-                "países": ["ES", "AR", "CL", "PE", "CO", "EC", "UY", "VE"],
-                "sitio": "movistar.{tld}",
-                "tld": {"ES": "es", "AR": "com.ar", "CL": "cl", "PE": "pe", "CO": "co", "EC": "ec", "UY": "com.uy", "VE": "com.ve"},
-                "tipo": ["Móvil", "Fijo", "Internet"]
-            },
-            "Vodafone": {
-                "países": ["ES", "GB", "DE", "IT", "PT", "IE", "NL", "GR"],
-                "sitio": "vodafone.{tld}",
-                "tld": {"ES": "es", "GB": "co.uk", "DE": "de", "IT": "it", "PT": "pt", "IE": "ie", "NL": "nl", "GR": "gr"},
-                "tipo": ["Móvil", "Fijo", "Internet"]
-            },
-            "Claro": {
-                "países": ["BR", "MX", "AR", "CO", "CL", "PE", "EC", "DO", "PA", "NI", "GT", "SV", "HN", "CR"],
-                "sitio": "claro{tld}",
-                "tld": {"BR": ".com.br", "MX": ".com.mx", "AR": ".com.ar", "CO": ".com.co", "CL": ".cl", "PE": ".pe", "EC": ".com.ec"},
-                "tipo": ["Móvil", "Fijo", "Internet", "TV"]
-            },
-            "T-Mobile": {
-                "países": ["US", "DE", "PL", "CZ", "HU", "AT", "NL"],
-                "sitio": "t-mobile.{tld}",
-                "tld": {"US": "com", "DE": "de", "PL": "pl", "CZ": "cz", "HU": "hu", "AT": "at", "NL": "nl"},
-                "tipo": ["Móvil", "Internet"]
-            },
-            "AT&T": {
-                "países": ["US", "MX"],
-                "sitio": "att.{tld}",
-                "tld": {"US": "com", "MX": "com.mx"},
-                "tipo": ["Móvil", "Fijo", "Internet", "TV"]
-            },
-            "Verizon": {
-                "países": ["US"],
-                "sitio": "verizon.com",
-                "tipo": ["Móvil", "Fijo", "Internet", "TV"]
-            },
-            "Orange": {
-                "países": ["ES", "FR", "PL", "BE", "RO", "SK", "MD"],
-                "sitio": "orange.{tld}",
-                "tld": {"ES": "es", "FR": "fr", "PL": "pl", "BE": "be", "RO": "ro", "SK": "sk", "MD": "md"},
-                "tipo": ["Móvil", "Fijo", "Internet", "TV"]
-            }
-        }
+        ctx = get_context(number)
+        carrier_name = prefix_lookup(ctx, language="en")[1]
+        if carrier_name is None:
+            carrier_name = carrier.name_for_number(ctx.parsed, "en")
+        carrier_name = carrier_name or "Desconocida"
+        country_code = ctx.region_code
         
         carrier_info = {"Operadora": carrier_name}
-        
-        # Buscar coincidencia en la base de datos
-        for name, data in carriers_db.items():
-            if name.lower() in carrier_name.lower():
-                # Construir URL del sitio web
-                tld = data.get("tld", {}).get(country_code, "com")
-                sitio = data["sitio"].format(tld=tld)
-                
-                carrier_info.update({
-                    "Sitio web oficial": f"https://www.{sitio}",
-                    "Países de operación": data["países"],
-                    "Servicios ofrecidos": data["tipo"],
-                    "Identificada_en_BD": True
-                })
-                break
-        else:
-            carrier_info["Identificada_en_BD"] = False
+        carrier_info.update(resolve_carrier(carrier_name, country_code))
         
         return carrier_info
     except Exception as e:
         return {"error": f"No se pudo obtener información: {str(e)}"}
 
+@memoize_by_region()
+def resolve_carrier(carrier_name, country_code):
+    """Datos de la operadora en la base de datos local para una región"""
+    return CARRIER_INDEX.lookup(carrier_name, country_code)
+
 def check_number_reputation(number):
     """Análisis de reputación mejorado con detección de patrones"""
     try:
-        parsed = phonenumbers.parse(number, None)
-        national_num = str(parsed.national_number)
-        country_code = phonenumbers.region_code_for_number(parsed)
-        
-        # Patrones de números sospechosos
-        suspicious_patterns = [
-            r'(\d)\1{5,}',      # 6+ dígitos repetidos
-            r'123456\d*',        # Secuencia ascendente
-            r'654321\d*',        # Secuencia descendente
-            r'(\d{3})\1',        # Patrones repetidos (ej: 123123)
-            r'^0{5,}',           # Muchos ceros al inicio
-            r'^1{5,}',           # Muchos unos al inicio
-            r'^(\d)\d\1\d\1\d',  # Patrón alternante (ej: 121212)
-            r'^555\d{4}',        # Números ficticios (US)
-            r'^999\d{4}',        # Números ficticios (UK)
-            r'^123123',          # Patrón obvio
-            r'^321321',          # Patrón obvio inverso
-            r'^(\d{2})\1\1',     # Repetición de pares (ej: 121212)
-            r'^(\d)\1(\d)\2(\d)\3'  # Patrón AABBCC
-        ]
-        
-        risk_factors = 0
-        matched_patterns = []
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, national_num):
-                risk_factors += 1
-                matched_patterns.append(pattern)
-        
-        # Reglas específicas por país
-        country_specific_risks = {
-            "US": ["^555", "^800", "^900", "^456", "^411"],
-            "GB": ["^999", "^555", "^4479", "^4480"],
-            "ES": ["^900", "^901", "^902", "^803", "^806", "^807"],
-            "MX": ["^900", "^800", "^555", "^123"]
-        }
-        
-        if country_code in country_specific_risks:
-            for pattern in country_specific_risks[country_code]:
-                if re.search(pattern, national_num):
-                    risk_factors += 2  # Más riesgo si coincide con patrones del país
-                    matched_patterns.append(f"Específico_{country_code}:{pattern}")
-        
-        # Evaluar reputación basada en factores
-        reputation = "Baja"
-        if risk_factors > 3:
-            reputation = "Muy Alta"
-        elif risk_factors > 2:
-            reputation = "Alta"
-        elif risk_factors > 1:
-            reputation = "Media"
-        
-        return {
-            "Factores_de_riesgo": risk_factors,
-            "Patrones_sospechosos": matched_patterns if matched_patterns else "Ninguno detectado",
-            "Calificación_de_reputación": reputation,
-            "Recomendación": "Extrema precaución" if risk_factors > 3 else 
-                            "Precaución" if risk_factors > 1 else 
-                            "Parece legítimo",
-            "Notas": "Números con patrones repetitivos o secuenciales son comúnmente usados para spam/fraude" if risk_factors > 0 else ""
-        }
+        ctx = get_context(number)
+        risk_factors, matched_patterns = REPUTATION_ENGINE.evaluate(ctx.national_digits, ctx.region_code)
+        return reputation_report(risk_factors, matched_patterns)
     except Exception as e:
         return {"error": str(e)}
 
 def check_phone_blacklists(number):
     """Verificación en listas negras públicas"""
     try:
-        parsed = phonenumbers.parse(number, None)
-        clean_num = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164).replace("+", "")
-        national_num = str(parsed.national_number)
+        ctx = get_context(number)
+        clean_num = ctx.e164_digits
         
         blacklists = {
             "ShouldIAnswer": f"https://www.shouldianswer.com/phone/{clean_num}",
@@ -441,15 +1655,16 @@ def check_phone_blacklists(number):
 def check_phone_format_variations(number):
     """Genera todas las variaciones de formato posibles"""
     try:
-        parsed = phonenumbers.parse(number, None)
-        national_num = str(parsed.national_number)
-        country_code = phonenumbers.region_code_for_number(parsed)
+        ctx = get_context(number)
+        parsed = ctx.parsed
+        national_num = ctx.national_digits
+        country_code = ctx.region_code
         
         variations = {
-            "E164": phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164),
-            "Internacional": phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
-            "Nacional": phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL),
-            "RFC3966": phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.RFC3966),
+            "E164": ctx.e164,
+            "Internacional": ctx.international,
+            "Nacional": ctx.national,
+            "RFC3966": ctx.rfc3966,
             "Sin_formato": national_num,
             "Solo_código_de_área": get_area_code(parsed, country_code),
             "Solo_línea": get_line_number(parsed, country_code),
@@ -511,49 +1726,864 @@ def save_to_file(number, data):
     
     return txt_filename, json_filename
 
-def parallel_check(number, functions):
-    """Ejecuta verificaciones en paralelo con mejor manejo de errores"""
-    results = {}
-    priority_order = [
-        "Información_básica",
-        "Búsqueda_en_Google",
-        "Información_de_operadora",
-        "Reputación_del_número",
-        "Redes_sociales",
-        "Listas_negras",
-        "Variaciones_de_formato"
-    ]
+class JsonLinesSink:
+    """Salida de registros en JSON Lines: un registro compacto por línea en un solo archivo
     
-    # Reordenar funciones según prioridad
-    ordered_functions = {k: functions[k] for k in priority_order if k in functions}
-    ordered_functions.update({k: functions[k] for k in functions if k not in priority_order})
+    Acumula los registros y los escribe por bloques de `flush_every`; con `max_bytes` rota a un
+    segmento nuevo (`<nombre>.00001.jsonl`, ...) al superar ese tamaño sin comprimir. La
+    compresión ('gzip' o 'zstd') se deduce de la extensión (.gz / .zst) si no se indica.
+    Sobre un flujo que no es un archivo normal (terminal, tubería) cada registro se escribe al
+    momento, para que quien lee la salida la reciba a medida que avanza el lote.
+    Es seguro usar una misma instancia desde varios hilos.
+    """
     
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {}
-        
-        # Ejecutar funciones prioritarias primero
-        for name, func in ordered_functions.items():
-            try:
-                futures[executor.submit(func, number)] = name
-                time.sleep(random.uniform(0.5, 1.5))  # Espaciar solicitudes
-            except Exception as e:
-                results[name] = {"error": f"Error al programar: {str(e)}"}
-        
-        # Procesar resultados a medida que completan
-        for future in as_completed(futures):
-            name = futures[future]
-            try:
-                results[name] = future.result()
-            except Exception as e:
-                results[name] = {"error": f"Error en ejecución: {str(e)}"}
+    COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
     
-    return results
-
-def display_results(data, number):
-    """Muestra los resultados de forma organizada"""
-    clear_screen()
-    print(f"""
-╔{'═'*70}╗
+    def __init__(self, target, max_bytes=None, compression=None, flush_every=1000):
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._stream = None
+        self._written = 0
+        if isinstance(target, str):
+            self.path = target
+            self.compression = compression or self._compression_for(target)
+            self._segment = 0
+        else:
+            # Flujo ya abierto (p. ej. stdout): sin rotación ni compresión
+            self.path = None
+            self.compression = None
+            self._stream = target
+            if not self._is_regular_file(target):
+                self.flush_every = 1
+    
+    @staticmethod
+    def _is_regular_file(stream):
+        try:
+            return stat.S_ISREG(os.fstat(stream.fileno()).st_mode)
+        except (AttributeError, OSError, ValueError):
+            return False
+    
+    @classmethod
+    def _compression_for(cls, path):
+        for suffix, compression in cls.COMPRESSION_SUFFIXES.items():
+            if path.endswith(suffix):
+                return compression
+        return None
+    
+    def _segment_path(self, index):
+        if self.max_bytes is None:
+            return self.path
+        suffix = next((s for s in self.COMPRESSION_SUFFIXES if self.path.endswith(s)), "")
+        base = self.path[:len(self.path) - len(suffix)]
+        stem, ext = os.path.splitext(base)
+        return f"{stem}.{index:05d}{ext or '.jsonl'}{suffix}"
+    
+    def _open_segment(self):
+        path = self._segment_path(self._segment)
+        # Al reanudar una ejecución se continúa por el último segmento existente
+        while self.max_bytes is not None and os.path.exists(self._segment_path(self._segment + 1)):
+            self._segment += 1
+            path = self._segment_path(self._segment)
+        self._written = self._existing_bytes(path) if self.max_bytes is not None else 0
+        if self.compression == "gzip":
+            import gzip
+            self._stream = gzip.open(path, "at", encoding="utf-8")
+        elif self.compression == "zstd":
+            # zstandard solo es necesario para la salida comprimida con zstd
+            import zstandard
+            self._stream = zstandard.open(path, "at", encoding="utf-8")
+        elif self.compression is None:
+            self._stream = open(path, "a", encoding="utf-8", buffering=1 << 20)
+        else:
+            raise ValueError(f"Compresión desconocida: {self.compression}")
+    
+    def _existing_bytes(self, path):
+        """Tamaño sin comprimir de un segmento ya escrito, en la misma unidad que la rotación"""
+        if not os.path.exists(path):
+            return 0
+        if self.compression == "gzip":
+            import gzip
+            reader = gzip.open(path, "rb")
+        elif self.compression == "zstd":
+            import zstandard
+            # Cada reanudación añade un frame nuevo: hay que leerlos todos
+            reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True,
+                                                                closefd=True)
+        else:
+            return os.path.getsize(path)
+        size = 0
+        with reader:
+            for block in iter(lambda: reader.read(1 << 20), b""):
+                size += len(block)
+        return size
+    
+    def _rotate(self):
+        self._stream.close()
+        self._segment += 1
+        self._open_segment()
+    
+    def write_record(self, record):
+        """Añade un registro; se escribe en disco al completar el bloque"""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_buffer()
+    
+    def write_lines(self, lines):
+        """Añade registros ya serializados como líneas JSON (terminadas en salto de línea)"""
+        with self._lock:
+            self._buffer.extend(lines)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_buffer()
+    
+    def _flush_buffer(self):
+        if not self._buffer:
+            return
+        if self._stream is None:
+            self._open_segment()
+        if self.max_bytes is None:
+            self._stream.write("".join(self._buffer))
+        else:
+            for line in self._buffer:
+                if self._written >= self.max_bytes:
+                    self._rotate()
+                self._stream.write(line)
+                self._written += len(line.encode("utf-8"))
+        self._buffer.clear()
+        self._stream.flush()
+    
+    def flush(self):
+        with self._lock:
+            self._flush_buffer()
+    
+    def close(self):
+        with self._lock:
+            self._flush_buffer()
+            if self.path is not None and self._stream is not None:
+                self._stream.close()
+                self._stream = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Columnas de la exportación tabular y su tipo Arrow
+COLUMNAR_TYPES = {
+    "Número": "string",
+    "Válido": "bool",
+    "Código_de_país": "string",
+    "Operadora": "string",
+    "Tipo_de_número": "string",
+    "Zonas_horarias": "list<string>",
+    "Factores_de_riesgo": "int32",
+    "Calificación_de_reputación": "string",
+    "Menciones": "int32",
+    "Enlaces": "int32",
+}
+
+def flatten_record(record):
+    """Extrae de un registro del lote los campos estables como una fila plana (None si faltan)"""
+    results = record.get("Resultados") or {}
+    basic = results.get("Información_básica") or {}
+    reputation = results.get("Reputación_del_número") or {}
+    google = results.get("Búsqueda_en_Google") or {}
+    time_zones = basic.get("Zona horaria")
+    links = google.get("Enlaces relacionados")
+    return {
+        "Número": record.get("Número"),
+        "Válido": record.get("Válido"),
+        "Código_de_país": basic.get("Código de país"),
+        "Operadora": basic.get("Operadora"),
+        "Tipo_de_número": basic.get("Tipo de número"),
+        "Zonas_horarias": list(time_zones) if time_zones is not None else None,
+        "Factores_de_riesgo": reputation.get("Factores_de_riesgo"),
+        "Calificación_de_reputación": reputation.get("Calificación_de_reputación"),
+        "Menciones": google.get("Menciones"),
+        "Enlaces": len(links) if links is not None else None,
+    }
+
+class ColumnarSink:
+    """Exporta los registros del lote a Parquet o Arrow IPC por grupos de filas (requiere pyarrow)
+    
+    El formato se deduce de la extensión (.parquet, o .arrow/.feather para Arrow IPC). Cada
+    `row_group_size` registros se escribe un grupo de filas, así el archivo crece durante el
+    lote sin guardar todo en memoria. El archivo se reescribe en cada ejecución.
+    """
+    
+    FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+    
+    def __init__(self, path, row_group_size=65536, format=None):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.format = format or self.FORMATS.get(os.path.splitext(path)[1].lower())
+        if self.format not in ("parquet", "arrow"):
+            raise ValueError(f"Formato tabular desconocido para {path}")
+        self._columns = {name: [] for name in COLUMNAR_TYPES}
+        self._rows = 0
+        self._writer = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def schema():
+        # pyarrow solo es necesario para la exportación tabular
+        import pyarrow as pa
+        
+        types = {"string": pa.string(), "bool": pa.bool_(), "int32": pa.int32(),
+                 "list<string>": pa.list_(pa.string())}
+        return pa.schema([(name, types[kind]) for name, kind in COLUMNAR_TYPES.items()])
+    
+    def write_record(self, record):
+        row = flatten_record(record)
+        with self._lock:
+            for name, column in self._columns.items():
+                column.append(row[name])
+            self._rows += 1
+            if self._rows >= self.row_group_size:
+                self._write_row_group()
+    
+    def _open_writer(self):
+        import pyarrow as pa
+        
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, self.schema())
+        else:
+            self._writer = pa.ipc.new_file(self.path, self.schema())
+    
+    def _write_row_group(self):
+        if not self._rows:
+            return
+        import pyarrow as pa
+        
+        if self._writer is None:
+            self._open_writer()
+        self._writer.write_table(pa.Table.from_pydict(self._columns, schema=self.schema()))
+        for column in self._columns.values():
+            column.clear()
+        self._rows = 0
+    
+    def flush(self):
+        with self._lock:
+            self._write_row_group()
+    
+    def close(self):
+        with self._lock:
+            self._write_row_group()
+            if self._writer is None:
+                # Lote vacío: se deja igualmente un archivo válido con el esquema
+                self._open_writer()
+            self._writer.close()
+            self._writer = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class MultiSink:
+    """Reparte cada registro entre varios sinks (p. ej. JSON Lines y tabular)"""
+    
+    def __init__(self, *sinks):
+        self.sinks = sinks
+    
+    def write_record(self, record):
+        for sink in self.sinks:
+            sink.write_record(record)
+    
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+    
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+class ResultCache:
+    """Caché SQLite de resultados por (número E164, verificación) con caducidad por verificación
+    
+    Las peticiones simultáneas de la misma clave se agrupan: solo una calcula el resultado y
+    las demás esperan a que termine.
+    """
+    
+    def __init__(self, directory=None, ttls=None):
+        self.directory = directory or CACHE_DIR
+        self.ttls = dict(CHECK_CACHE_TTL if ttls is None else ttls)
+        self.version = phonenumbers.__version__
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, "resultados.sqlite3")
+        self._local = threading.local()
+        self._inflight = {}
+        self._inflight_async = {}
+        self._lock = threading.Lock()
+        
+        with self._connection() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS resultados (
+                                e164 TEXT NOT NULL,
+                                verificacion TEXT NOT NULL,
+                                guardado REAL NOT NULL,
+                                version TEXT NOT NULL,
+                                valor TEXT NOT NULL,
+                                PRIMARY KEY (e164, verificacion))""")
+    
+    def _connection(self):
+        # Una conexión por hilo; WAL permite lectores concurrentes con un escritor
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def is_cached(self, check_name):
+        return check_name in self.ttls
+    
+    def get(self, e164, check_name):
+        """Devuelve el resultado guardado o None si no existe o ha caducado"""
+        if check_name not in self.ttls:
+            return None
+        row = self._connection().execute(
+            "SELECT guardado, version, valor FROM resultados WHERE e164 = ? AND verificacion = ?",
+            (e164, check_name)).fetchone()
+        if row is None:
+            return None
+        stored, version, value = row
+        ttl = self.ttls[check_name]
+        if ttl is None and version != self.version_for(check_name):
+            return None
+        if ttl is not None and time.time() - stored > ttl:
+            return None
+        return json.loads(value)
+    
+    def version_for(self, check_name):
+        """Versión con la que se guarda una verificación: phonenumbers y sus datos propios"""
+        extra = CHECK_CACHE_VERSIONS.get(check_name)
+        return f"{self.version}+{extra()}" if extra else self.version
+    
+    @staticmethod
+    def has_errors(value):
+        """True si el resultado es un error o alguna de sus consultas falló (p. ej. un formato en Google)"""
+        if not isinstance(value, dict):
+            return False
+        if "error" in value:
+            return True
+        partial = value.get("Resultados_por_formato")
+        return isinstance(partial, dict) and any(
+            isinstance(item, str) and item.startswith("Error:") for item in partial.values())
+    
+    def put(self, e164, check_name, value):
+        """Guarda un resultado; los errores, aunque sean parciales, y lo calculado sin presupuesto no se guardan"""
+        if check_name not in self.ttls or self.has_errors(value):
+            return
+        deadline = _current_deadline.get()
+        if deadline is not None and deadline.expired():
+            return
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?)",
+                         (e164, check_name, time.time(), self.version_for(check_name),
+                          json.dumps(value, ensure_ascii=False)))
+    
+    def get_or_compute(self, e164, check_name, compute):
+        """Resultado en caché o calculado con `compute()`, una sola vez aunque haya concurrencia"""
+        if check_name not in self.ttls:
+            return compute()
+        cached = self.get(e164, check_name)
+        if cached is not None:
+            return cached
+        
+        key = (e164, check_name)
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return pending.result()
+        
+        try:
+            value = self.get(e164, check_name)
+            if value is None:
+                value = compute()
+                self.put(e164, check_name, value)
+            pending.set_result(value)
+            return value
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+    
+    async def get_or_compute_async(self, e164, check_name, compute):
+        """Como get_or_compute, pero `compute()` devuelve un awaitable
+        
+        Las consultas a SQLite bloquean: se hacen en el pool por defecto, fuera del bucle.
+        """
+        if check_name not in self.ttls:
+            return await compute()
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self.get, e164, check_name)
+        if cached is not None:
+            return cached
+        
+        key = (e164, check_name)
+        pending = self._inflight_async.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        async def run():
+            try:
+                value = await compute()
+                # put consulta el presupuesto del número, que está en el contexto
+                await loop.run_in_executor(None, contextvars.copy_context().run,
+                                           self.put, e164, check_name, value)
+                return value
+            finally:
+                del self._inflight_async[key]
+        
+        pending = self._inflight_async[key] = asyncio.ensure_future(run())
+        return await asyncio.shield(pending)
+
+def enable_result_cache(directory=None, ttls=None):
+    """Activa la caché persistente para parallel_check y el modo lote"""
+    global RESULT_CACHE
+    RESULT_CACHE = ResultCache(directory, ttls)
+    return RESULT_CACHE
+
+# Sink de eventos NDJSON, uno por verificación terminada (--events); None = desactivado
+CHECK_EVENTS = None
+
+def enable_check_events(stream=None):
+    """Emite por `stream` (stdout por defecto) un evento JSON por cada verificación terminada"""
+    global CHECK_EVENTS
+    CHECK_EVENTS = JsonLinesSink(stream or sys.stdout, flush_every=1)
+    return CHECK_EVENTS
+
+def emit_check_event(number, name, result, started):
+    if CHECK_EVENTS is not None:
+        CHECK_EVENTS.write_record({
+            "Evento": "verificación_terminada",
+            "Número": number,
+            "Verificación": name,
+            "Milisegundos": round((time.monotonic() - started) * 1000, 1),
+            "Resultado": result
+        })
+
+# Clases de coste de una verificación: cómo la ejecuta el planificador de parallel_check
+COST_PURE = "pure"        # solo construye datos a partir del número: se ejecuta en línea
+COST_CPU = "cpu"          # cálculo local: pool de CPU
+COST_NETWORK = "network"  # espera a la red: pool de red, con límite de concurrencia por host
+
+# Orden de lanzamiento: lo más lento primero para que arranque cuanto antes
+COST_ORDER = {COST_NETWORK: 0, COST_CPU: 1, COST_PURE: 2}
+
+# Con el GIL más hilos de CPU no suman rendimiento, pero evitan que una verificación lenta bloquee al resto
+CHECK_POOL_SIZES = {COST_CPU: max(4, os.cpu_count() or 1), COST_NETWORK: 32}
+
+# Verificaciones de red simultáneas por host (además del límite de peticiones por segundo)
+CHECK_HOST_CONCURRENCY = 16
+
+class CheckSpec:
+    """Declaración de una verificación: clase de coste, hosts a los que llama y dependencias"""
+    
+    __slots__ = ("cost", "hosts", "depends_on")
+    
+    def __init__(self, cost, hosts=(), depends_on=()):
+        self.cost = cost
+        self.hosts = tuple(hosts)
+        self.depends_on = tuple(depends_on)
+
+# Las verificaciones sin declarar se tratan como cálculo local, igual que antes del registro
+DEFAULT_CHECK_SPEC = CheckSpec(COST_CPU)
+
+_check_pools = {}
+_check_pools_lock = threading.Lock()
+_host_check_semaphores = {}
+
+def get_check_pool(cost):
+    """Pool compartido por todos los números para una clase de coste"""
+    pool = _check_pools.get(cost)
+    if pool is None:
+        with _check_pools_lock:
+            pool = _check_pools.get(cost)
+            if pool is None:
+                pool = _check_pools[cost] = ThreadPoolExecutor(max_workers=CHECK_POOL_SIZES[cost],
+                                                               thread_name_prefix=f"check-{cost}")
+    return pool
+
+def limit_hosts(hosts, task):
+    """Envuelve `task` para que respete CHECK_HOST_CONCURRENCY en cada uno de sus hosts"""
+    with _check_pools_lock:
+        semaphores = [_host_check_semaphores.setdefault(host, threading.BoundedSemaphore(CHECK_HOST_CONCURRENCY))
+                      for host in sorted(hosts)]
+    
+    def run():
+        for semaphore in semaphores:
+            semaphore.acquire()
+        try:
+            return task()
+        finally:
+            for semaphore in reversed(semaphores):
+                semaphore.release()
+    
+    return run
+
+def check_spec(func):
+    return CHECK_SPECS.get(func, DEFAULT_CHECK_SPEC)
+
+def check_dependencies(functions):
+    """Nombre de cada verificación -> nombres de las verificaciones de las que depende"""
+    names = {func: name for name, func in functions.items()}
+    return {name: {names[dep] for dep in check_spec(func).depends_on if dep in names}
+            for name, func in functions.items()}
+
+def parallel_check(number, functions, budget=None, on_result=None):
+    """Ejecuta las verificaciones de un número según su clase de coste (CHECK_SPECS)
+    
+    Las de red se lanzan primero en el pool de red, con límite por host; las de CPU en el pool
+    de CPU; las puras se ejecutan aquí mismo mientras tanto, sin pasar por ningún pool. Una
+    verificación con dependencias espera a que terminen. Con `budget` (o NUMBER_DEADLINE) en
+    segundos, las que no terminen a tiempo se marcan como TIMEOUT_RESULT. Cada resultado se
+    entrega en cuanto está listo a `on_result(nombre, resultado)` y a CHECK_EVENTS.
+    """
+    results = {}
+    started = time.monotonic()
+    
+    def report(name, result):
+        results[name] = result
+        if on_result is not None:
+            on_result(name, result)
+        emit_check_event(number, name, result, started)
+    budget = budget if budget is not None else NUMBER_DEADLINE
+    deadline = Deadline(budget) if budget is not None else None
+    
+    # Analizar el número una sola vez para todas las verificaciones
+    try:
+        ctx = get_context(number)
+    except Exception as e:
+        return {name: {"error": f"Número no analizable: {str(e)}"} for name in functions}
+    
+    waiting = check_dependencies(functions)
+    futures = {}
+    
+    def launch_ready():
+        """Lanza lo que ya no espera a nadie; devuelve los futures nuevos"""
+        launched = []
+        while True:
+            ready = sorted((name for name, deps in waiting.items() if deps <= results.keys()),
+                           key=lambda name: COST_ORDER[check_spec(functions[name]).cost])
+            if not ready:
+                return launched
+            for name in ready:
+                del waiting[name]
+                func = functions[name]
+                spec = check_spec(func)
+                task = lambda func=func: func(ctx)
+                if spec.cost == COST_PURE:
+                    try:
+                        report(name, run_with_deadline(deadline, instrument_check(name, task)))
+                    except Exception as e:
+                        report(name, {"error": f"Error en ejecución: {str(e)}"})
+                    continue
+                if RESULT_CACHE is not None:
+                    task = lambda name=name, task=task: RESULT_CACHE.get_or_compute(ctx.e164, name, task)
+                task = instrument_check(name, task)
+                if spec.hosts:
+                    task = limit_hosts(spec.hosts, task)
+                try:
+                    future = get_check_pool(spec.cost).submit(run_with_deadline, deadline, task)
+                    futures[future] = name
+                    launched.append(future)
+                except Exception as e:
+                    report(name, {"error": f"Error al programar: {str(e)}"})
+    
+    # Procesar resultados a medida que completan y lanzar lo que dependía de ellos
+    pending = set()
+    try:
+        pending = set(launch_ready())
+        while pending:
+            done, pending = wait(pending, timeout=deadline.remaining() if deadline else None,
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError
+            for future in done:
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": f"Error en ejecución: {str(e)}"}
+                report(name, result)
+            pending |= set(launch_ready())
+    except TimeoutError:
+        # Las verificaciones abandonadas terminan solas: sus peticiones usan el mismo presupuesto
+        for future in pending:
+            future.cancel()
+        for name in list(futures.values()) + list(waiting):
+            if name not in results:
+                report(name, dict(TIMEOUT_RESULT))
+                METRICS.inc("check_timeouts_total", check=name)
+        waiting.clear()
+    
+    for name in waiting:
+        report(name, {"error": "Dependencias circulares o sin resolver"})
+    
+    METRICS.observe("number_seconds", time.monotonic() - started)
+    return results
+
+class AsyncHTTPEngine:
+    """Motor HTTP asyncio con cientos de peticiones en vuelo y límite de concurrencia por host"""
+    
+    def __init__(self, max_connections=200, per_host_limits=None, default_host_limit=8, timeout=10,
+                 rate_limiter=None):
+        self.max_connections = max_connections
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        self.per_host_limits = per_host_limits or {}
+        self.default_host_limit = default_host_limit
+        self.timeout = timeout
+        self._host_semaphores = {}
+        self._session = None
+    
+    async def __aenter__(self):
+        # aiohttp solo es necesario para el modo asíncrono
+        import aiohttp
+        
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            headers=HTTP_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+    
+    def _host_semaphore(self, url):
+        host = urllib.parse.urlsplit(url).hostname or ""
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            limit = self.per_host_limits.get(host, self.default_host_limit)
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(limit)
+        return semaphore
+    
+    async def stream_into(self, url, sink, chunk_size=16384, max_bytes=None):
+        """Como stream_into(), pero sobre el motor asyncio; devuelve el estado HTTP
+        
+        En el bucle solo se reciben los trozos (hasta `max_bytes`); el cuerpo se decodifica y
+        se entrega a `sink` de una vez en el pool de verificaciones locales, fuera del bucle.
+        """
+        max_bytes = max_bytes or MAX_BODY_BYTES
+        received = 0
+        host = urllib.parse.urlsplit(url).hostname or ""
+        delay = await self.rate_limiter.wait_async(url)
+        if delay:
+            METRICS.observe("rate_limit_wait_seconds", delay, host=host)
+        status = None
+        chunks = []
+        async with self._host_semaphore(url):
+            started = time.monotonic()
+            try:
+                async with self._session.get(url) as response:
+                    status = response.status
+                    response.raise_for_status()
+                    encoding = response.charset or "utf-8"
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        received += len(chunk)
+                        chunks.append(chunk)
+                        if received >= max_bytes:
+                            break
+            finally:
+                record_http(host, started, received, status)
+        await asyncio.get_running_loop().run_in_executor(
+            get_check_pool(COST_CPU), _feed_body, sink, b"".join(chunks), encoding)
+        return status
+
+def _feed_body(sink, body, encoding):
+    """Decodifica un cuerpo ya descargado y lo entrega entero a `sink`"""
+    sink.feed(body.decode(encoding, errors="replace"))
+    sink.close()
+
+async def async_check_google_search(number, engine):
+    """Variante asíncrona de check_google_search: todos los formatos se consultan a la vez"""
+    try:
+        ctx = get_context(number)
+        formats, queries = google_search_queries(ctx)
+        
+        results = {
+            "Enlaces relacionados": set(),
+            "Menciones": 0,
+            "Formatos buscados": formats,
+            "Resultados_por_formato": {}
+        }
+        
+        extractors = [GoogleResultExtractor(clean_num) for _, clean_num, _ in queries]
+        pages = await asyncio.gather(*(engine.stream_into(url, extractor)
+                                       for (_, _, url), extractor in zip(queries, extractors)),
+                                     return_exceptions=True)
+        
+        for (num_format, _, _), extractor, page in zip(queries, extractors, pages):
+            if isinstance(page, Exception):
+                results["Resultados_por_formato"][num_format] = f"Error: {str(page)}"
+            else:
+                add_google_results(results, num_format, extractor)
+        
+        results["Enlaces relacionados"] = list(results["Enlaces relacionados"])[:10]
+        return results
+    except Exception as e:
+        return {"error": f"Búsqueda fallida: {str(e)}"}
+
+# Verificaciones de red con implementación asyncio
+ASYNC_CHECK_VARIANTS = {
+    check_google_search: async_check_google_search
+}
+
+async def _call_inline(func, ctx):
+    return func(ctx)
+
+async def _after_dependencies(dependencies, make_coroutine):
+    if dependencies:
+        await asyncio.wait(dependencies)
+    return await make_coroutine()
+
+async def parallel_check_async(number, functions, engine, budget=None):
+    """Como parallel_check, pero la red va por el motor asyncio y el resto por los pools"""
+    try:
+        ctx = get_context(number)
+    except Exception as e:
+        return {name: {"error": f"Número no analizable: {str(e)}"} for name in functions}
+    
+    budget = budget if budget is not None else NUMBER_DEADLINE
+    deadline = Deadline(budget) if budget is not None else None
+    _current_deadline.set(deadline)
+    
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    waiting = check_dependencies(functions)
+    tasks = {}
+    while True:
+        # Se crean en orden topológico para que cada tarea pueda esperar a sus dependencias
+        ready = sorted((name for name, deps in waiting.items() if deps <= tasks.keys()),
+                       key=lambda name: COST_ORDER[check_spec(functions[name]).cost])
+        if not ready:
+            break
+        for name in ready:
+            func = functions[name]
+            spec = check_spec(func)
+            if func in ASYNC_CHECK_VARIANTS:
+                compute = lambda func=func: ASYNC_CHECK_VARIANTS[func](ctx, engine)
+            elif spec.cost == COST_PURE:
+                compute = lambda func=func: _call_inline(func, ctx)
+            else:
+                task = lambda func=func: func(ctx)
+                if spec.hosts:
+                    task = limit_hosts(spec.hosts, task)
+                # run_in_executor no propaga el contexto: se pasa explícitamente
+                compute = lambda task=task, pool=get_check_pool(spec.cost): loop.run_in_executor(
+                    pool, contextvars.copy_context().run, task)
+            if RESULT_CACHE is not None and spec.cost != COST_PURE:
+                make = lambda name=name, compute=compute: RESULT_CACHE.get_or_compute_async(ctx.e164, name, compute)
+            else:
+                make = compute
+            dependencies = [tasks[dep] for dep in waiting.pop(name)]
+            tasks[name] = asyncio.ensure_future(instrument_check_async(name, _after_dependencies(dependencies, make)))
+            if CHECK_EVENTS is not None:
+                tasks[name].add_done_callback(
+                    lambda task, name=name: task.cancelled() or emit_check_event(
+                        number, name, task.result() if task.exception() is None
+                        else {"error": f"Error en ejecución: {str(task.exception())}"}, started))
+    
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=deadline.remaining() if deadline else None)
+    
+    results = {name: {"error": "Dependencias circulares o sin resolver"} for name in waiting}
+    for name, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            results[name] = dict(TIMEOUT_RESULT)
+            METRICS.inc("check_timeouts_total", check=name)
+        elif task.exception() is not None:
+            results[name] = {"error": f"Error en ejecución: {str(task.exception())}"}
+        else:
+            results[name] = task.result()
+    return results
+
+async def analyze_number_async(number, functions, engine):
+    """Versión asíncrona de analyze_number"""
+    try:
+        if not validate_phone_number(number):
+            return {"Número": number, "Válido": False}
+        return {"Número": number, "Válido": True, "Resultados": await parallel_check_async(number, functions, engine)}
+    except Exception as e:
+        return {"Número": number, "error": f"Error en ejecución: {str(e)}"}
+
+async def run_batch_async(numbers, functions=None, output=None, max_in_flight=200,
+                          engine_options=None, progress_every=1000, save_reports=False):
+    """Modo lote sobre asyncio: muchos números a la vez con las peticiones limitadas por host"""
+    functions = functions or CHECK_FUNCTIONS
+    sink = as_sink(output)
+    stats = {"Procesados": 0, "Válidos": 0, "Inicio": time.monotonic()}
+    next_report = progress_every
+    
+    async with AsyncHTTPEngine(**(engine_options or {})) as engine:
+        pending = set()
+        for number in numbers:
+            pending.add(asyncio.ensure_future(analyze_number_async(number, functions, engine)))
+            
+            if len(pending) >= max_in_flight:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                _write_batch_records(done, sink, stats, save_reports)
+            
+            if progress_every and stats["Procesados"] >= next_report:
+                _report_progress(stats, sink=sink)
+                next_report += progress_every
+        
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            _write_batch_records(done, sink, stats, save_reports)
+    
+    sink.flush()
+    _report_progress(stats, final=True, sink=sink)
+    return stats
+
+def section_summary(name, result):
+    """Resumen de una línea de una sección recién terminada, para el modo progresivo"""
+    if not isinstance(result, dict):
+        return str(result)
+    if result.get("error"):
+        return f"error: {result['error']}"
+    if name == "Información_básica":
+        return " · ".join(str(result.get(key, "?")) for key in ("País", "Operadora", "Tipo de número"))
+    if name == "Reputación_del_número":
+        return f"reputación {result.get('Calificación_de_reputación', 'Desconocida')}, {result.get('Recomendación', '')}"
+    if name == "Búsqueda_en_Google":
+        return f"{result.get('Menciones', 0)} menciones, {len(result.get('Enlaces relacionados') or [])} enlaces"
+    if name == "Información_de_operadora":
+        return result.get("Operadora", "Desconocida")
+    return f"{len(result)} campos"
+
+def progress_printer(started=None):
+    """Callback para parallel_check(on_result=...) que imprime cada sección según termina"""
+    started = started or time.monotonic()
+    
+    def on_result(name, result):
+        elapsed = (time.monotonic() - started) * 1000
+        print(f"[{elapsed:7.0f} ms] {name.replace('_', ' ')}: {section_summary(name, result)}", flush=True)
+    
+    return on_result
+
+def display_results(data, number, clear=True):
+    """Muestra los resultados de forma organizada"""
+    if clear:
+        clear_screen()
+    print(f"""
+╔{'═'*70}╗
 ║{'RESUMEN DE ANÁLISIS':^70}║
 ╠{'═'*70}╣
 ║ Número: {number:<59}║
@@ -586,16 +2616,16 @@ def display_results(data, number):
     if not google.get("error"):
         print(f"\n{' BÚSQUEDA EN INTERNET ':=^70}")
         print(f"• Menciones encontradas: {google.get('Menciones', 0)}")
-        if google.get("Enlaces_relacionados"):
-            print(f"• Enlaces relevantes encontrados: {len(google['Enlaces_relacionados'])}")
+        if google.get("Enlaces relacionados"):
+            print(f"• Enlaces relevantes encontrados: {len(google['Enlaces relacionados'])}")
     
     # Operadora
     carrier = data.get("Información_de_operadora", {})
     if not carrier.get("error"):
         print(f"\n{' INFORMACIÓN DE OPERADORA ':=^70}")
         print(f"• Nombre: {carrier.get('Operadora', 'Desconocida')}")
-        if carrier.get('Sitio_web_oficial'):
-            print(f"• Sitio web: {carrier['Sitio_web_oficial']}")
+        if carrier.get('Sitio web oficial'):
+            print(f"• Sitio web: {carrier['Sitio web oficial']}")
     
     # Advertencias
     if reputation.get("Calificación_de_reputación", "") in ["Alta", "Muy Alta"]:
@@ -606,7 +2636,845 @@ def display_results(data, number):
     print(f"\n{'═'*70}")
     print("Nota: Para detalles completos, consulte los archivos de reporte generados")
 
-def main():
+# Funciones de verificación
+CHECK_FUNCTIONS = {
+    "Información_básica": get_basic_info,
+    "Búsqueda_en_Google": check_google_search,
+    "Redes_sociales": check_social_media,
+    "Información_de_operadora": check_carrier_info,
+    "Reputación_del_número": check_number_reputation,
+    "Listas_negras": check_phone_blacklists,
+    "Variaciones_de_formato": check_phone_format_variations
+}
+
+# Registro de verificaciones: clase de coste, hosts y dependencias (ver parallel_check)
+CHECK_SPECS = {
+    get_basic_info: CheckSpec(COST_CPU),
+    check_google_search: CheckSpec(COST_NETWORK, hosts=["www.google.com"]),
+    check_social_media: CheckSpec(COST_PURE),
+    check_carrier_info: CheckSpec(COST_CPU),
+    check_number_reputation: CheckSpec(COST_CPU),
+    check_phone_blacklists: CheckSpec(COST_PURE),
+    check_phone_format_variations: CheckSpec(COST_PURE),
+}
+
+def iter_numbers(source):
+    """Genera los números de un archivo (o de stdin con '-') línea a línea sin cargarlo entero"""
+    stream = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8')
+    try:
+        for line in stream:
+            number = line.strip()
+            if number and not number.startswith('#'):
+                yield number
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def canonicalize(number):
+    """Forma E164 de un número tal como viene en la entrada, o None si no se puede analizar
+    
+    Usa el contexto de la caché, así el análisis posterior del mismo número no vuelve a parsearlo.
+    """
+    try:
+        return get_context(number).e164
+    except phonenumbers.NumberParseException:
+        return None
+
+class BloomFilter:
+    """Conjunto aproximado de tamaño fijo: sin falsos negativos, falsos positivos con prob. ~error_rate"""
+    
+    def __init__(self, capacity, error_rate=1e-6):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+        return ((first + i * second) % self.size for i in range(self.hashes))
+    
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+class DedupStage:
+    """Etapa previa al reparto: cada número distinto (en E164) se analiza una sola vez
+    
+    `filter()` deja pasar solo la primera aparición de cada número; usada además como sink,
+    reenvía cada registro a `sink` junto con una copia por cada otra forma de escribir el mismo
+    número (con su "Número" original). Los números vistos se recuerdan exactamente hasta
+    `max_exact`; a partir de ahí en un filtro de Bloom. Los últimos `max_records` registros se
+    guardan para copiarlos; si un duplicado del conjunto exacto llega cuando su registro ya no
+    está, se emite {"Número": ..., "Duplicado_de": <E164>} apuntando al registro anterior de la
+    salida. Un acierto solo del filtro de Bloom puede ser un falso positivo: si no se confirma
+    con un registro guardado o en curso, el número se analiza de nuevo en lugar de descartarlo.
+    """
+    
+    def __init__(self, sink, max_exact=1_000_000, max_records=2000, bloom_capacity=10_000_000,
+                 error_rate=1e-6):
+        self.sink = sink
+        self.max_exact = max_exact
+        self.max_records = max_records
+        self.bloom_capacity = bloom_capacity
+        self.error_rate = error_rate
+        self.duplicates = 0
+        self._seen = set()
+        self._bloom = None
+        self._pending = {}
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _mark_seen(self, key):
+        if len(self._seen) < self.max_exact:
+            self._seen.add(key)
+            return
+        if self._bloom is None:
+            self._bloom = BloomFilter(self.bloom_capacity, self.error_rate)
+        self._bloom.add(key)
+    
+    def filter(self, numbers):
+        """Genera los números a analizar, reteniendo los duplicados para copiarles el resultado"""
+        for number in numbers:
+            key = canonicalize(number)
+            if key is None:
+                yield number
+                continue
+            with self._lock:
+                if key in self._pending:
+                    self._pending[key].append(number)
+                    self.duplicates += 1
+                    continue
+                record = self._records.get(key)
+                if record is not None:
+                    duplicate = dict(record, Número=number)
+                    self.duplicates += 1
+                elif key in self._seen:
+                    duplicate = {"Número": number, "Duplicado_de": key}
+                    self.duplicates += 1
+                else:
+                    # Nuevo, o solo en el filtro de Bloom (sin poder confirmarlo): se analiza
+                    if self._bloom is None or key not in self._bloom:
+                        self._mark_seen(key)
+                    self._pending[key] = []
+                    duplicate = None
+            if duplicate is None:
+                yield number
+            else:
+                self.sink.write_record(duplicate)
+    
+    def write_record(self, record):
+        self.sink.write_record(record)
+        number = record.get("Número")
+        key = canonicalize(number) if number is not None else None
+        if key is None:
+            return
+        with self._lock:
+            waiting = self._pending.pop(key, [])
+            self._records[key] = record
+            self._records.move_to_end(key)
+            if len(self._records) > self.max_records:
+                self._records.popitem(last=False)
+        for original in waiting:
+            self.sink.write_record(dict(record, Número=original))
+    
+    def flush(self):
+        self.sink.flush()
+    
+    def close(self):
+        # Duplicados de números cuyo registro nunca llegó (error al analizarlos)
+        with self._lock:
+            orphans = [(key, number) for key, numbers in self._pending.items() for number in numbers]
+            self._pending.clear()
+        for key, number in orphans:
+            self.sink.write_record({"Número": number, "Duplicado_de": key})
+        self.sink.close()
+
+def analyze_number(number, functions):
+    """Valida y analiza un número, devolviendo un registro listo para serializar"""
+    try:
+        if not validate_phone_number(number):
+            return {"Número": number, "Válido": False}
+        return {"Número": number, "Válido": True, "Resultados": parallel_check(number, functions)}
+    except Exception as e:
+        return {"Número": number, "error": f"Error en ejecución: {str(e)}"}
+
+def as_sink(output):
+    """Devuelve `output` como sink (acepta un sink, un flujo abierto o None para stdout)"""
+    if hasattr(output, "write_record"):
+        return output
+    return JsonLinesSink(output or sys.stdout)
+
+def _write_batch_record(record, sink, stats, save_reports=False):
+    """Escribe un registro en el sink y actualiza las estadísticas"""
+    sink.write_record(record)
+    stats["Procesados"] += 1
+    if record.get("Válido"):
+        stats["Válidos"] += 1
+        if save_reports:
+            save_to_file(record["Número"], record["Resultados"])
+
+def _write_batch_records(futures, sink, stats, save_reports=False):
+    """Escribe los registros terminados en el sink y actualiza las estadísticas"""
+    for future in futures:
+        try:
+            record = future.result()
+        except Exception as e:
+            # Las funciones de análisis ya devuelven sus errores con "Número"; esto no debería darse
+            record = {"error": f"Error en ejecución: {str(e)}"}
+        _write_batch_record(record, sink, stats, save_reports)
+
+def _report_progress(stats, final=False, sink=None):
+    """Muestra el rendimiento acumulado del lote por stderr
+    
+    Si el sink deduplica, sus copias (que no se analizan) se cuentan aparte en "Duplicados".
+    """
+    elapsed = time.monotonic() - stats["Inicio"]
+    rate = stats["Procesados"] / elapsed if elapsed > 0 else 0.0
+    label = "Lote terminado" if final else "Lote en curso"
+    duplicates = ""
+    if hasattr(sink, "duplicates"):
+        stats["Duplicados"] = sink.duplicates
+        duplicates = f", {sink.duplicates} duplicados"
+    print(f"[{label}] {stats['Procesados']} números, {stats['Válidos']} válidos{duplicates}, "
+          f"{rate:.1f} núm/s", file=sys.stderr)
+    if METRICS_FILE:
+        METRICS.dump(METRICS_FILE)
+
+def run_batch(numbers, functions=None, output=None, max_in_flight=8, progress_every=1000,
+              save_reports=False):
+    """Procesa un flujo de números con trabajo en vuelo acotado y emite un JSON por línea
+    
+    Con `save_reports` también se generan los reportes .json/.txt de cada número válido.
+    """
+    functions = functions or CHECK_FUNCTIONS
+    sink = as_sink(output)
+    stats = {"Procesados": 0, "Válidos": 0, "Inicio": time.monotonic()}
+    next_report = progress_every
+    
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        pending = set()
+        for number in numbers:
+            pending.add(executor.submit(analyze_number, number, functions))
+            
+            # No leer más entrada hasta que se libere hueco
+            if len(pending) >= max_in_flight * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _write_batch_records(done, sink, stats, save_reports)
+            
+            if progress_every and stats["Procesados"] >= next_report:
+                _report_progress(stats, sink=sink)
+                next_report += progress_every
+        
+        _write_batch_records(as_completed(pending), sink, stats, save_reports)
+    
+    sink.flush()
+    _report_progress(stats, final=True, sink=sink)
+    return stats
+
+# Verificaciones que esperan a la red; el resto solo usa CPU y puede repartirse entre procesos
+NETWORK_CHECKS = {func for func, spec in CHECK_SPECS.items() if spec.cost == COST_NETWORK}
+
+def _init_offline_worker(carrier_index, prefix_index=None, cache=None):
+    """Inicializa un proceso del pool con la misma base de operadoras, índice de prefijos y
+    caché de resultados (directorio y caducidades) que el principal"""
+    global CARRIER_INDEX, PREFIX_INDEX, RESULT_CACHE
+    CARRIER_INDEX = carrier_index
+    PREFIX_INDEX = prefix_index
+    RESULT_CACHE = ResultCache(*cache) if cache is not None else None
+    resolve_carrier.cache_clear()
+
+def _offline_worker_args():
+    """Argumentos de _init_offline_worker con el estado actual del proceso principal"""
+    cache = (RESULT_CACHE.directory, RESULT_CACHE.ttls) if RESULT_CACHE is not None else None
+    return CARRIER_INDEX, PREFIX_INDEX, cache
+
+def _run_local_check(name, ctx):
+    """Ejecuta una verificación local en un proceso del pool, pasando por la caché si está activa"""
+    func = CHECK_FUNCTIONS[name]
+    if RESULT_CACHE is None:
+        return func(ctx)
+    return RESULT_CACHE.get_or_compute(ctx.e164, name, lambda: func(ctx))
+
+def _analyze_offline_chunk(numbers, check_names):
+    """Trabajo de un proceso: valida un bloque de números y ejecuta sus verificaciones locales"""
+    records = []
+    for number in numbers:
+        if not validate_phone_number(number):
+            records.append({"Número": number, "Válido": False})
+            continue
+        ctx = get_context(number)
+        results = {}
+        for name in check_names:
+            try:
+                results[name] = _run_local_check(name, ctx)
+            except Exception as e:
+                results[name] = {"error": f"Error en ejecución: {str(e)}"}
+        records.append({"Número": number, "Válido": True, "Resultados": results})
+    return records
+
+def _complete_network_checks(record, network_functions):
+    """Añade a un registro ya analizado en un proceso las verificaciones de red"""
+    try:
+        record["Resultados"].update(parallel_check(record["Número"], network_functions))
+        return record
+    except Exception as e:
+        return {"Número": record["Número"], "error": f"Error en ejecución: {str(e)}"}
+
+def run_batch_hybrid(numbers, functions=None, output=None, processes=None, chunk_size=256,
+                     io_workers=8, progress_every=1000, save_reports=False):
+    """Modo lote híbrido: verificaciones locales en un pool de procesos, las de red en hilos
+    
+    Los números se envían a los procesos en bloques de `chunk_size` para amortizar el coste de
+    serializarlos. Solo admite verificaciones de CHECK_FUNCTIONS (los procesos las buscan por
+    nombre). Sin verificaciones de red escala con el número de núcleos.
+    """
+    functions = functions or CHECK_FUNCTIONS
+    for name, func in functions.items():
+        if func not in NETWORK_CHECKS and CHECK_FUNCTIONS.get(name) is not func:
+            raise ValueError(f"La verificación {name} no está en CHECK_FUNCTIONS")
+    cpu_names = [name for name, func in functions.items() if func not in NETWORK_CHECKS]
+    network_functions = {name: func for name, func in functions.items() if func in NETWORK_CHECKS}
+    processes = processes or os.cpu_count() or 1
+    sink = as_sink(output)
+    stats = {"Procesados": 0, "Válidos": 0, "Inicio": time.monotonic()}
+    next_report = progress_every
+    
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_offline_worker,
+                             initargs=_offline_worker_args()) as pool, \
+            ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+        chunk_futures = {}
+        io_futures = set()
+        
+        def collect_chunks(done):
+            for future in done:
+                chunk = chunk_futures.pop(future)
+                try:
+                    records = future.result()
+                except Exception as e:
+                    # Un registro de error por cada número del bloque para no perder ninguno
+                    error = f"Error en ejecución: {str(e)}"
+                    records = [{"Número": number, "error": error} for number in chunk]
+                for record in records:
+                    if network_functions and record.get("Válido"):
+                        io_futures.add(io_pool.submit(_complete_network_checks, record, network_functions))
+                    else:
+                        _write_batch_record(record, sink, stats, save_reports)
+        
+        numbers = iter(numbers)
+        chunks = iter(lambda: list(itertools.islice(numbers, chunk_size)), [])
+        for chunk in chunks:
+            chunk_futures[pool.submit(_analyze_offline_chunk, chunk, cpu_names)] = chunk
+            
+            # No leer más entrada hasta que se libere hueco en los procesos o en la red
+            if len(chunk_futures) >= processes * 2:
+                done, _ = wait(chunk_futures, return_when=FIRST_COMPLETED)
+                collect_chunks(done)
+            while len(io_futures) >= io_workers * 2:
+                done, io_futures = wait(io_futures, return_when=FIRST_COMPLETED)
+                _write_batch_records(done, sink, stats, save_reports)
+            
+            if progress_every and stats["Procesados"] >= next_report:
+                _report_progress(stats, sink=sink)
+                next_report += progress_every
+        
+        collect_chunks(as_completed(list(chunk_futures)))
+        _write_batch_records(as_completed(io_futures), sink, stats, save_reports)
+    
+    sink.flush()
+    _report_progress(stats, final=True, sink=sink)
+    return stats
+
+# Tamaño por defecto de cada rango del lector por fragmentos (--sharded); cada rango en vuelo
+# ocupa unas 50 veces más en memoria una vez analizado
+SHARD_BYTES = 256 * 1024
+
+def shard_ranges(path, shard_bytes=SHARD_BYTES):
+    """Divide un archivo en rangos de bytes [inicio, fin) que empiezan y acaban en un salto de línea
+    
+    Solo se lee la página de cada frontera para buscar el siguiente salto de línea; el resto del
+    archivo no pasa por este proceso.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    ranges = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            end = min(start + shard_bytes, size)
+            if end < size:
+                newline = data.find(b"\n", end - 1)
+                end = size if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def _analyze_shard(path, start, end, check_names, encode=True):
+    """Trabajo de un proceso: lee, valida y analiza las líneas de un rango del archivo mapeado
+    
+    Cada registro lleva en "Desplazamiento" el byte donde empieza su línea. Con `encode` se
+    devuelven ya como líneas JSON, que el proceso principal escribe sin volver a serializarlas.
+    """
+    records = []
+    valid = 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        data.seek(start)
+        offset = start
+        while offset < end:
+            raw = data.readline()
+            line = raw.strip()
+            if line and not line.startswith(b"#"):
+                number = line.decode('utf-8', 'replace')
+                if validate_phone_number(number):
+                    ctx = get_context(number)
+                    results = {}
+                    for name in check_names:
+                        try:
+                            results[name] = _run_local_check(name, ctx)
+                        except Exception as e:
+                            results[name] = {"error": f"Error en ejecución: {str(e)}"}
+                    record = {"Número": number, "Desplazamiento": offset, "Válido": True, "Resultados": results}
+                    valid += 1
+                else:
+                    record = {"Número": number, "Desplazamiento": offset, "Válido": False}
+                if encode:
+                    record = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                records.append(record)
+            offset += len(raw)
+    return records, valid
+
+def _shard_error_records(path, start, end, error, encode=True):
+    """Registros de error, uno por número, para un rango cuyo proceso ha fallado"""
+    records = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        data.seek(start)
+        offset = start
+        while offset < end:
+            raw = data.readline()
+            line = raw.strip()
+            if line and not line.startswith(b"#"):
+                record = {"Número": line.decode('utf-8', 'replace'), "Desplazamiento": offset, "error": error}
+                if encode:
+                    record = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                records.append(record)
+            offset += len(raw)
+    return records
+
+def run_batch_sharded(path, check_names=("Información_básica",), output=None, processes=None,
+                      shard_bytes=SHARD_BYTES, progress_every=100000, save_reports=False):
+    """Modo lote para archivos enormes: cada proceso mapea el archivo y analiza su rango
+    
+    El proceso principal solo calcula las fronteras (shard_ranges) y escribe los resultados en
+    el orden de entrada; nunca lee ni envía líneas. Solo verificaciones locales de
+    CHECK_FUNCTIONS (por defecto validación e información básica) y sin deduplicación.
+    """
+    for name in check_names:
+        if name not in CHECK_FUNCTIONS or CHECK_FUNCTIONS[name] in NETWORK_CHECKS:
+            raise ValueError(f"La verificación {name} no es una verificación local de CHECK_FUNCTIONS")
+    processes = processes or os.cpu_count() or 1
+    sink = as_sink(output)
+    # Las líneas ya serializadas solo sirven si el sink las acepta tal cual
+    encode = hasattr(sink, "write_lines") and not save_reports
+    stats = {"Procesados": 0, "Válidos": 0, "Inicio": time.monotonic()}
+    next_report = progress_every
+    
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_offline_worker,
+                             initargs=_offline_worker_args()) as pool:
+        pending = []
+        ranges = iter(shard_ranges(path, shard_bytes))
+        
+        def submit_next():
+            shard = next(ranges, None)
+            if shard is not None:
+                future = pool.submit(_analyze_shard, path, shard[0], shard[1], list(check_names), encode)
+                pending.append((future, shard))
+        
+        for _ in range(processes * 2):
+            submit_next()
+        while pending:
+            future, shard = pending.pop(0)
+            try:
+                records, valid = future.result()
+            except Exception as e:
+                records = _shard_error_records(path, shard[0], shard[1], f"Error en ejecución: {str(e)}", encode)
+                valid = 0
+            submit_next()
+            if encode:
+                sink.write_lines(records)
+                stats["Procesados"] += len(records)
+                stats["Válidos"] += valid
+            else:
+                for record in records:
+                    _write_batch_record(record, sink, stats, save_reports)
+            if progress_every and stats["Procesados"] >= next_report:
+                _report_progress(stats, sink=sink)
+                next_report = stats["Procesados"] + progress_every
+    
+    sink.flush()
+    _report_progress(stats, final=True, sink=sink)
+    return stats
+
+# Límites del modo servicio para acotar memoria: tamaño del cuerpo, números por lote,
+# conexiones abiertas (un hilo cada una) y segundos que puede estar inactiva una conexión
+SERVICE_MAX_BODY_BYTES = 1024 * 1024
+SERVICE_MAX_BATCH = 1000
+SERVICE_MAX_CONNECTIONS = 256
+SERVICE_IDLE_TIMEOUT = 30
+
+class ServiceBusy(Exception):
+    """El servicio ya tiene el máximo de números en curso"""
+
+class PhoneService:
+    """Modo servicio: el mismo análisis que el modo interactivo detrás de una API HTTP local
+    
+    Metadatos de phonenumbers, reglas compiladas, cachés y pools de conexiones se quedan
+    cargados entre peticiones. Las peticiones simultáneas del mismo número (en cualquier forma
+    de escribirlo) comparten un único análisis, y como mucho `max_pending` números esperan o
+    se analizan a la vez; por encima se responde 503.
+    """
+    
+    def __init__(self, functions=None, workers=32, max_pending=1024, queue_timeout=30):
+        self.functions = functions or CHECK_FUNCTIONS
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._admission = threading.BoundedSemaphore(max_pending)
+        self._inflight = {}
+        self._lock = threading.Lock()
+    
+    def warm_up(self, number="+34600112233"):
+        """Carga metadatos y reglas antes de la primera petición real"""
+        validate_phone_number(number)
+        for func in self.functions.values():
+            if func not in NETWORK_CHECKS:
+                func(number)
+        get_http_session()
+    
+    def submit(self, number):
+        """Future con el registro del número; se une al análisis en curso si ya hay uno"""
+        key = canonicalize(number) or number
+        with self._lock:
+            shared = self._inflight.get(key)
+        if shared is None:
+            if not self._admission.acquire(timeout=self.queue_timeout):
+                raise ServiceBusy("Demasiados números en curso")
+            with self._lock:
+                shared = self._inflight.get(key)
+                owner = shared is None
+                if owner:
+                    shared = self._inflight[key] = self._executor.submit(analyze_number, number, self.functions)
+            if owner:
+                shared.add_done_callback(lambda _: self._release(key))
+                METRICS.inc("service_numbers_total")
+            else:
+                # Otra petición del mismo número se adelantó mientras se esperaba turno
+                self._admission.release()
+                METRICS.inc("service_coalesced_total")
+        else:
+            METRICS.inc("service_coalesced_total")
+        
+        future = Future()
+        
+        def deliver(done):
+            # Cada petición recibe el registro con el número tal como lo escribió
+            if done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(dict(done.result(), Número=number))
+        
+        shared.add_done_callback(deliver)
+        return future
+    
+    def _release(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+        self._admission.release()
+    
+    def analyze(self, number):
+        return self.submit(number).result()
+    
+    def analyze_many(self, numbers):
+        """Registros de varios números en el orden de entrada"""
+        futures = [self.submit(number) for number in numbers]
+        return [future.result() for future in futures]
+    
+    def status(self):
+        with self._lock:
+            return {"estado": "ok", "en_curso": len(self._inflight)}
+    
+    def make_server(self, host="127.0.0.1", port=8080, max_connections=SERVICE_MAX_CONNECTIONS):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        service = self
+        
+        class ServiceHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Las conexiones keep-alive inactivas se cierran y liberan su hilo
+            timeout = SERVICE_IDLE_TIMEOUT
+            
+            def _send(self, status, body, content_type="application/json; charset=utf-8"):
+                if not isinstance(body, str):
+                    body = json.dumps(body, ensure_ascii=False)
+                body = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def _read_json(self):
+                length = int(self.headers["Content-Length"])
+                if length < 0:
+                    raise ValueError("Content-Length negativo")
+                if length > SERVICE_MAX_BODY_BYTES:
+                    raise ValueError("Cuerpo demasiado grande")
+                return json.loads(self.rfile.read(length) or b"null")
+            
+            def _handle(self, route, payload):
+                if route == "/analizar":
+                    number = payload.get("numero") if isinstance(payload, dict) else None
+                    if not number:
+                        return self._send(400, {"error": "Falta el parámetro 'numero'"})
+                    return self._send(200, service.analyze(number))
+                if route == "/lote":
+                    numbers = payload.get("numeros") if isinstance(payload, dict) else payload
+                    if not isinstance(numbers, list) or not all(isinstance(n, str) for n in numbers):
+                        return self._send(400, {"error": "Se espera una lista 'numeros' de cadenas"})
+                    if len(numbers) > SERVICE_MAX_BATCH:
+                        return self._send(413, {"error": f"Máximo {SERVICE_MAX_BATCH} números por lote"})
+                    return self._send(200, {"Resultados": service.analyze_many(numbers)})
+                return self._send(404, {"error": "Ruta desconocida"})
+            
+            def _dispatch(self, route, payload_factory):
+                try:
+                    self._handle(route, payload_factory())
+                except ServiceBusy as e:
+                    self._send(503, {"error": str(e)})
+                except ValueError as e:
+                    # El cuerpo puede haberse quedado sin leer: la conexión no se reutiliza
+                    self.close_connection = True
+                    self._send(400, {"error": f"Petición no válida: {str(e)}"})
+                except Exception as e:
+                    self._send(500, {"error": f"Error en ejecución: {str(e)}"})
+            
+            def do_GET(self):
+                parts = urllib.parse.urlsplit(self.path)
+                if parts.path == "/salud":
+                    return self._send(200, service.status())
+                rendered = METRICS.render(parts.path)
+                if rendered is not None:
+                    return self._send(200, *rendered)
+                # Un '+' literal en la consulta es el prefijo internacional, no un espacio
+                query = urllib.parse.parse_qs(parts.query.replace("+", "%2B"))
+                self._dispatch(parts.path, lambda: {"numero": query.get("numero", [None])[0]})
+            
+            def do_POST(self):
+                if self.headers.get("Content-Length") is None:
+                    self.close_connection = True
+                    return self._send(411, {"error": "Falta la cabecera Content-Length"})
+                self._dispatch(urllib.parse.urlsplit(self.path).path, self._read_json)
+            
+            def log_message(self, *args):
+                pass
+        
+        class BoundedHTTPServer(ThreadingHTTPServer):
+            """Un hilo por conexión, pero como mucho `max_connections`; por encima se responde 503"""
+            daemon_threads = True
+            
+            def __init__(self, address, handler):
+                super().__init__(address, handler)
+                self._slots = threading.BoundedSemaphore(max_connections)
+            
+            def process_request(self, request, client_address):
+                if not self._slots.acquire(blocking=False):
+                    try:
+                        request.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n"
+                                        b"Connection: close\r\n\r\n")
+                    except OSError:
+                        pass
+                    self.shutdown_request(request)
+                    return
+                try:
+                    super().process_request(request, client_address)
+                except Exception:
+                    self._slots.release()
+                    raise
+            
+            def process_request_thread(self, request, client_address):
+                try:
+                    super().process_request_thread(request, client_address)
+                finally:
+                    self._slots.release()
+        
+        return BoundedHTTPServer((host, port), ServiceHandler)
+
+def run_service(address, functions=None, workers=32):
+    """Arranca el modo servicio en `address` ('PUERTO' o 'HOST:PUERTO') hasta Ctrl+C"""
+    host, _, port = address.rpartition(":")
+    service = PhoneService(functions, workers=workers)
+    service.warm_up()
+    server = service.make_server(host or "127.0.0.1", int(port))
+    print(f"Servicio escuchando en http://{server.server_address[0]}:{server.server_address[1]} "
+          f"(/analizar?numero=..., POST /lote, /salud, /metrics)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def parse_args(argv=None):
+    """Opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Analizador de números telefónicos (OSINT)")
+    parser.add_argument("--batch", metavar="ARCHIVO",
+                        help="Procesa en lote los números de ARCHIVO, uno por línea ('-' para stdin)")
+    parser.add_argument("--output", "-o", metavar="ARCHIVO",
+                        help="Archivo JSON Lines de salida (por defecto stdout en modo lote); "
+                             "con extensión .gz o .zst se comprime")
+    parser.add_argument("--rotate-mb", type=float, metavar="MB",
+                        help="Rota el archivo de salida en segmentos de este tamaño")
+    parser.add_argument("--compress", choices=["gzip", "zstd"],
+                        help="Compresión de la salida si no se deduce de la extensión")
+    parser.add_argument("--columnar", metavar="ARCHIVO",
+                        help="Exporta además columnas tipadas a Parquet (.parquet) o Arrow (.arrow); requiere pyarrow")
+    parser.add_argument("--per-number-files", action="store_true",
+                        help="En modo lote, genera también los reportes .json/.txt de cada número")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Números analizados simultáneamente en modo lote (por defecto 8)")
+    parser.add_argument("--pool-size", type=int, default=HTTP_POOL_MAXSIZE,
+                        help=f"Conexiones keep-alive por host (por defecto {HTTP_POOL_MAXSIZE})")
+    parser.add_argument("--rate", action="append", default=[], metavar="HOST=PPS[:RÁFAGA]",
+                        help="Límite de peticiones por segundo para un host (repetible), ej: www.google.com=0.5:2")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reutiliza resultados anteriores desde la caché persistente (SQLite)")
+    parser.add_argument("--cache-dir", metavar="DIR", default=CACHE_DIR,
+                        help=f"Directorio de la caché persistente (por defecto {CACHE_DIR})")
+    parser.add_argument("--carriers", metavar="ARCHIVO",
+                        help="Base de operadoras en JSON (mismo formato que CARRIERS_DB)")
+    parser.add_argument("--prefix-index", action="store_true",
+                        help="Consulta operadora, zona y zonas horarias en un índice de prefijos compilado "
+                             "(se genera en --cache-dir la primera vez)")
+    parser.add_argument("--index-regions", metavar="ES,MX,...",
+                        help="Regiones que incluye el índice de prefijos (por defecto todas)")
+    parser.add_argument("--deadline", type=float, metavar="SEGUNDOS",
+                        help="Tiempo máximo por número; lo que no termine se marca como agotado")
+    parser.add_argument("--metrics-file", metavar="ARCHIVO",
+                        help="Vuelca las métricas por verificación y host (.json o texto Prometheus)")
+    parser.add_argument("--metrics-port", type=int, metavar="PUERTO",
+                        help="Sirve las métricas en http://127.0.0.1:PUERTO/metrics y /metrics.json")
+    parser.add_argument("--processes", type=int, metavar="N",
+                        help="Modo lote híbrido: verificaciones locales en N procesos (0 = un proceso por núcleo) "
+                             "y las de red en --workers hilos")
+    parser.add_argument("--chunk-size", type=int, default=256,
+                        help="Números enviados a cada proceso de una vez en el modo híbrido (por defecto 256)")
+    parser.add_argument("--sharded", action="store_true",
+                        help="Lote de un archivo enorme: cada proceso de --processes mapea el archivo y "
+                             "valida y analiza (información básica) su rango de líneas")
+    parser.add_argument("--shard-mb", type=float, default=SHARD_BYTES / (1024 * 1024),
+                        help="Tamaño de cada rango de --sharded en MB (por defecto 0.25)")
+    parser.add_argument("--no-dedup", dest="dedup", action="store_false",
+                        help="Analiza cada línea aunque sea el mismo número escrito de otra forma")
+    parser.add_argument("--serve", metavar="[HOST:]PUERTO",
+                        help="Modo servicio: API HTTP local (/analizar, /lote) con --workers análisis a la vez")
+    parser.add_argument("--progressive", action="store_true",
+                        help="Modo interactivo: muestra cada sección en cuanto termina, sin esperar a la más lenta")
+    parser.add_argument("--events", action="store_true",
+                        help="Modo lote: emite por stdout un evento JSON por verificación terminada (requiere -o)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Modo lote sobre asyncio (requiere aiohttp); --workers pasa a ser números en vuelo")
+    parser.add_argument("--max-connections", type=int, default=200,
+                        help="Conexiones HTTP simultáneas del modo asyncio (por defecto 200)")
+    parser.add_argument("--host-concurrency", action="append", default=[], metavar="[HOST=]N",
+                        help="Peticiones simultáneas a un host en el modo asyncio; sin HOST cambia el "
+                             "valor por defecto (8). Repetible")
+    args = parser.parse_args(argv)
+    if args.processes is not None and args.use_async:
+        parser.error("--processes y --async no se pueden combinar")
+    if args.events and not (args.batch and args.output):
+        parser.error("--events requiere --batch y --output (stdout queda para los eventos)")
+    if args.events and args.processes is not None:
+        parser.error("--events y --processes no se pueden combinar")
+    if args.sharded and (not args.batch or args.batch == '-'):
+        parser.error("--sharded requiere --batch con un archivo (no stdin)")
+    if args.sharded and (args.use_async or args.events):
+        parser.error("--sharded no se puede combinar con --async ni con --events")
+    if args.serve and (args.output or args.columnar):
+        parser.error("--serve no guarda resultados: no se puede combinar con --output ni con --columnar")
+    return args
+
+def main(argv=None):
+    global NUMBER_DEADLINE, METRICS_FILE
+    args = parse_args(argv)
+    NUMBER_DEADLINE = args.deadline
+    METRICS_FILE = args.metrics_file
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    if args.pool_size != HTTP_POOL_MAXSIZE:
+        configure_http_pool(pool_maxsize=args.pool_size)
+    if args.cache:
+        enable_result_cache(args.cache_dir)
+    if args.carriers:
+        load_carrier_index(args.carriers)
+    if args.prefix_index:
+        enable_prefix_index(args.cache_dir, args.index_regions.split(",") if args.index_regions else None)
+    for rule in args.rate:
+        host, _, limit = rule.partition("=")
+        rate, _, burst = limit.partition(":")
+        RATE_LIMITER.set_limit(host, float(rate), int(burst or 1))
+    
+    sink = None
+    if args.output:
+        max_bytes = int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None
+        sink = JsonLinesSink(args.output, max_bytes=max_bytes, compression=args.compress)
+    
+    if args.serve:
+        run_service(args.serve, CHECK_FUNCTIONS, workers=args.workers)
+        return
+    
+    if args.batch:
+        if args.events:
+            enable_check_events()
+        sink = sink or JsonLinesSink(sys.stdout)
+        if args.columnar:
+            sink = MultiSink(sink, ColumnarSink(args.columnar))
+        if args.sharded:
+            try:
+                run_batch_sharded(args.batch, output=sink, processes=args.processes,
+                                  shard_bytes=int(args.shard_mb * 1024 * 1024),
+                                  save_reports=args.per_number_files)
+            finally:
+                sink.close()
+            return
+        numbers = iter_numbers(args.batch)
+        if args.dedup:
+            sink = DedupStage(sink)
+            numbers = sink.filter(numbers)
+        engine_options = {"max_connections": args.max_connections, "per_host_limits": {}}
+        for rule in args.host_concurrency:
+            host, _, limit = rule.rpartition("=")
+            if host:
+                engine_options["per_host_limits"][host] = int(limit)
+            else:
+                engine_options["default_host_limit"] = int(limit)
+        try:
+            if args.use_async:
+                asyncio.run(run_batch_async(numbers, CHECK_FUNCTIONS, sink,
+                                            max_in_flight=args.workers,
+                                            engine_options=engine_options,
+                                            save_reports=args.per_number_files))
+            elif args.processes is not None:
+                run_batch_hybrid(numbers, CHECK_FUNCTIONS, sink, processes=args.processes,
+                                 chunk_size=args.chunk_size, io_workers=args.workers,
+                                 save_reports=args.per_number_files)
+            else:
+                run_batch(numbers, CHECK_FUNCTIONS, sink, max_in_flight=args.workers,
+                          save_reports=args.per_number_files)
+        finally:
+            sink.close()
+        return
+    
     clear_screen()
     print(f"""
 ╔{'═'*70}╗
@@ -628,29 +3496,29 @@ def main():
             
         print("\nRecopilando información... Esto puede tomar unos minutos.\n")
         
-        # Funciones de verificación
-        check_functions = {
-            "Información_básica": get_basic_info,
-            "Búsqueda_en_Google": check_google_search,
-            "Redes_sociales": check_social_media,
-            "Información_de_operadora": check_carrier_info,
-            "Reputación_del_número": check_number_reputation,
-            "Listas_negras": check_phone_blacklists,
-            "Variaciones_de_formato": check_phone_format_variations
-        }
-        
         # Ejecutar verificaciones
-        data = parallel_check(number, check_functions)
+        if args.progressive:
+            data = parallel_check(number, CHECK_FUNCTIONS, on_result=progress_printer())
+        else:
+            data = parallel_check(number, CHECK_FUNCTIONS)
         
         # Guardar resultados
         txt_file, json_file = save_to_file(number, data)
+        if sink is not None:
+            sink.write_record({"Número": number, "Válido": True, "Resultados": data})
+            sink.flush()
+        if METRICS_FILE:
+            METRICS.dump(METRICS_FILE)
         
-        # Mostrar resumen
-        display_results(data, number)
+        # Mostrar resumen (en modo progresivo, debajo de las secciones ya mostradas)
+        display_results(data, number, clear=not args.progressive)
         
         print(f"\nReportes guardados en:")
         print(f"- Formato texto: {txt_file}")
         print(f"- Formato JSON: {json_file}\n")
+    
+    if sink is not None:
+        sink.close()
 
 if __name__ == "__main__":
     main()